@@ -1,6 +1,18 @@
+import functools
+from importlib import resources
+
 from utils.environment import is_cloud_based_environment
 
+
+@functools.cache
+def _load_doc(name: str) -> str:
+    """Read a Markdown doc shipped alongside this module, once per process."""
+    return resources.files("tools").joinpath(name).read_text(encoding="utf-8")
+
+
 class About:
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -48,9 +60,10 @@ class About:
         return topic_mapping[topic]()
 
 
-    def _get_virtual_env_section(self) -> str:
+    @staticmethod
+    def _get_virtual_env_section(is_cloud: bool) -> str:
         """Generate virtual environment setup section based on environment."""
-        if is_cloud_based_environment():
+        if is_cloud:
             virtual_env_section = """### 1. No virtual environment setup required
 
 The required Python packages
@@ -337,7 +350,13 @@ pb run --begin_time '2024-11-01T00:00:00Z'
         return docs
 
     def about_pb_cli(self) -> str:
-        virtual_env_section = self._get_virtual_env_section()
+        return self._render_pb_cli(is_cloud_based_environment())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2)
+    def _render_pb_cli(is_cloud: bool) -> str:
+        """Render the CLI guide once per environment (cloud vs local)."""
+        virtual_env_section = About._get_virtual_env_section(is_cloud)
 
         docs = f"""
 # Profile Builder CLI Commands
@@ -1605,448 +1624,14 @@ For more detailed information about creating and using macros, use `about_profil
         """
         return docs
 
-    def about_macros(self) -> str:
-        docs = """
-# Macros in Profiles: Reusable Code Blocks
-
-## Overview
-Macros are reusable blocks of code that can be used in a Profiles project as a form of templating.
-They operate similar to functions in that you can reuse them with different parameters, reducing repetition
-and making your profiles code more modular and maintainable.
-
-## Defining Macros
-You can define macros in the `macros.yaml` file in your model folder, and call them within any other profiles YAML file.
-
-```yaml
-macros:
-    - name: macro_name          # Required - Name used to call the macro
-      inputs:                   # Required - Parameters for the macro
-          - list_of_parameters
-      value: "code as string"   # Required - Macro code in string format
-```
-
-## Key Components
-
-1. **name** (Required): Name of the macro used to call it
-2. **inputs**: Parameters that can be passed to the macro
-3. **value** (Required): The actual code/logic of the macro
-
-## Syntax Rules
-
-- Macros use the pongo2 templating syntax
-- Macros operate on YAML code itself, generating new code before execution
-- Input parameters are referenced using double curly brackets: `{{input}}`
-- Control logic (if, else, endif) is defined within `{% %}` tags
-- Reserved input words are `this` and `warehouse`
+    @staticmethod
+    def about_macros() -> str:
+        return _load_doc("about_macros.md")
 
-## Examples
-
-### 1. Simple Macro with One Input
-```yaml
-macros:
-  - name: array_agg
-    inputs:
-        - column_name
-    value: "array_agg(distinct {{column_name}})"
-```
-
-### 2. Macro with Multiple Inputs
-```yaml
-macros:
-  - name: macro_listagg
-    inputs:
-        - column
-        - timestamp
-    value: "LISTAGG({{column}}, ',') WITHIN group (order by {{timestamp}} ASC)"
-```
-
-### 3. Macro with No Inputs
-```yaml
-macros:
-  - name: frame_clause
-    value: "frame_condition = 'rows between unbounded preceding and unbounded following'"
-```
-
-### 4. Conditional Logic Based on Warehouse Type
-```yaml
-macros:
-  - name: macro_listagg
-    inputs:
-        - column
-        - timestamp
-    value: "{% if warehouse.DatabaseType() == \"bigquery\" %} STRING_AGG({{column}}, ',' ORDER BY {{timestamp}} ASC) {% else %} LISTAGG({{column}}, ',') WITHIN group (order by {{timestamp}} ASC) {% endif %}"
-```
-
-### 5. Complex Date Handling Across Warehouses
-```yaml
-macros:
-  - name: macro_datediff
-    inputs:
-        - column
-    value: |
-        {% if warehouse.DatabaseType() == \"bigquery\" %}
-          {% if !(end_time|isnil) %}
-            date_diff(date('{{end_time.Format(\"2006-01-02 15:04:05\")}}'), date({{column}}), day)
-          {% else %}
-            date_diff(CURRENT_DATE(), date({{column}}), day)
-          {% endif %}
-        {% else %}
-          {% if !(end_time|isnil) %}
-            datediff(day, date({{column}}), date('{{end_time.Format(\"2006-01-02 15:04:05\")}}'))
-          {% else %}
-            datediff(day, date({{column}}), GETDATE())
-          {% endif %}
-        {% endif %}
-```
-
-## Using Macros in Features
-Once defined in macros.yaml, you can call macros in your feature definitions:
-
-```yaml
-# In profiles.yaml
-- entity_var:
-    name: all_anonymous_ids
-    select: "{{ array_agg(anonymous_id) }}"
-    from: inputs/rsIdentity
-
-# Using date difference macro
-- entity_var:
-    name: days_since_first_seen
-    select: "{{ macro_datediff('min(timestamp)') }}"
-    from: inputs/rsPages
-```
-
-## Best Practices
-
-1. **Naming Convention**: Use descriptive names with a `macro_` prefix
-2. **Comments**: Add comments to explain complex macros
-3. **Warehouse Compatibility**: Use conditional logic for warehouse-specific implementations
-4. **Testing**: Test macros with different inputs before using in production
-5. **Modularity**: Keep macros focused on a single purpose
-6. **Documentation**: Document parameters and expected behavior
-
-## Common Use Cases
-
-- **Aggregation Functions**: Standardize aggregations across your project
-- **Date Handling**: Handle date calculations consistently
-- **String Manipulations**: Create consistent text transformations
-- **Cross-Warehouse Compatibility**: Abstract warehouse-specific syntax
-- **Complex Calculations**: Encapsulate multi-step calculations
-        """
-        return docs
-
-    def about_profiles_output(self) -> str:
+    @staticmethod
+    def about_profiles_output() -> str:
         """
         Structured guide for AI agents on post-run validation and output analysis.
         Provides clear workflows, success criteria, and troubleshooting steps.
         """
-        docs = """
-# 🔍 Post-Run Validation & Output Analysis
-
-## 🚨 **STRONGLY RECOMMENDED: Run These Commands First**
-
-### 1. Audit Identity Stitching
-```bash
-pb audit id_stitcher
-```
-- **When to run**: After every successful `pb run`
-- **Purpose**: Analyzes identity graph and stitching effectiveness
-- **Look for**: Disconnected identity clusters, low stitching rates, warnings from the audit
-- **Success indicator**: Clean identity graphs with expected connections. Low singleton clusters in common identifiable id types (ex - email). High singleton clusters in non-identifiable id types (ex - anonymous_id) is okay.
-
-### 2. Validate Run Logs
-- **Location**: `logs/pb.log` (project root) or configured log path
-- **Search for**: `ERROR`, `WARNING`, `FAILED` keywords
-- **Important**: Even "Program completed successfully" can hide warnings. So always check the logs. Also, this is a cumulative file, so if you run multiple times, the logs will be appended. Check for the last run.
-- **Action if issues found**: Check specific error messages and refer to troubleshooting guides
-
-## 🔄 **RECOVERING FROM FAILED RUNS: Using --seq_no**
-
-### 🚨 CRITICAL FOR AI AGENTS: ALWAYS Use --seq_no After Failures
-
-When `pb run` fails partway through, **ALWAYS continue from the last run using --seq_no**. This is a critical performance optimization that:
-- Reuses successfully completed models (pb detects changes via model hash)
-- Only re-executes failed models and models with configuration changes
-- Saves significant warehouse costs and execution time
-- Works intelligently even after you fix errors and change configurations
-
-### How to Extract seq_no from pb run Output
-
-**Method 1: Parse pb run terminal output** (Most Reliable)
-The pb run output contains a line like:
-```
-To use this seq, run `pb run --seq_no 5`
-```
-**AI Agents: Extract the number from this line automatically from terminal output.**
-
-**Method 2: Check output directory**
-```bash
-ls -ltr output/<env>/
-```
-The most recently created directory number is your seq_no.
-
-**Method 3: Check logs/pb.log**
-Search for "seq_no" or "Seq" in the most recent run section.
-
-### How to Continue After Fixing Errors
-```bash
-pb run --seq_no <extracted_seq_no>
-```
-
-### Why This Always Works
-pb uses model hashing - it automatically:
-- Detects which models have changed (different hash)
-- Reuses unchanged models from previous seq_no
-- Re-runs only changed models and their downstream dependencies
-- Maintains consistency across all runs
-
-### Example Recovery Workflow
-```bash
-pb run --begin_time '2025-01-01T00:00:00Z'
-ERROR: Propensity model 'churn_model' configuration error
-
-ls -ltr output/dev/
-drwxr-xr-x  5 user  staff  160 Jan 15 10:23 7
-
-Fix the error in profiles.yaml
-
-pb run --seq_no 7
-```
-
-### AI Agent Best Practices
-1. **ALWAYS capture seq_no** from every pb run output (parse terminal output)
-2. **On any failure, ALWAYS suggest retry with --seq_no** after fixes
-3. **Never suggest plain 'pb run'** after a failed run - always use --seq_no
-4. **Inform user** about time/cost savings (can be 10x faster for large projects)
-5. **Extract seq_no automatically** - don't ask user to find it manually
-
-## ✅ **SUCCESS CRITERIA CHECKLIST**
-
-After a successful run, verify:
-- [ ] No ERROR messages in logs
-- [ ] `pb audit id_stitcher` completes without issues - Optional. If id-stitcher is not modified, we don't need to run this.
-- [ ] Feature tables contain expected row counts (use run_query)
-- [ ] Output folder structure matches expected pattern
-- [ ] Warehouse tables accessible with correct schema
-
-## 📁 **Output Folder Structure**
-
-**Location**: Same directory as `pb_project.yaml`
-
-```
-output/
-├── <env>/                    # Environment (dev/prod from siteconfig)
-│   └── <seq_no>/            # Run sequence number (integer, starts at 1)
-│       ├── compile/         # Generated SQL (not executed)
-│       │   └── Material_*/  # Material folders with SQL files
-│       └── run/             # Executed SQL and results
-│           └── Material_*/  # Material folders with execution artifacts
-```
-
-**Example path**: `output/dev/4/run/Material_user_id_stitcher_f7ed8b2a_4/0.sql`
-
-### ⚠️ **Finding the Most Recent Run**
-Sequence numbers are NOT chronological (e.g., you might have folders 1, 2, 10 where 2 is most recent). To find the latest run:
-
-1. **Most reliable**: Check `logs/pb.log` for the most recent successful run sequence number
-2. **File system**: Use `ls -ltr output/<env>/` to see folders by creation time
-3. **Warehouse**: Query material registry tables for latest seq_no (if accessible)
-
-**AI Agent Tip**: Always verify which sequence number represents the most recent run before analyzing outputs.
-
-### Compile vs Run Folders
-| Folder | Purpose | Contents |
-|--------|---------|----------|
-| `compile/` | SQL generation phase | Generated SQL files (not executed) |
-| `run/` | Execution phase | Execution artifacts, some look identical to compile |
-
-## 🏗️ **Model-Specific Outputs**
-
-### Standard Models (ID Stitcher, Entity Vars)
-- **File type**: `.sql` files
-- **Location**: `output/<env>/<seq_no>/run/Material_<model_name>_<hash>_<seq_no>/`
-- **Validation**: Check SQL files for expected queries and table creation statements
-
-### Propensity Models
-Propensity models have two distinct phases with different outputs:
-
-#### Training Phase Output
-- **Triggered when**: Model needs retraining (based on `validity` parameter)
-- **Output location**: `output/<env>/<seq_no>/run/Material_<model_name>_<hash>_<seq_no>/`
-- **Files created**:
-  ```
-  Material_<model_name>_<hash>_<seq_no>/
-  ├── training_file.json                                    # Model metadata
-  └── training_reports/
-      ├── 01-feature-importance-chart-<model_name>_training.png
-      ├── 02-test-lift-chart-<model_name>_training.png
-      ├── 03-test-pr-auc-<model_name>_training.png
-      ├── 04-test-roc-auc-<model_name>_training.png
-      └── training_summary.json                             # Performance metrics
-  ```
-
-##### 🤖 **AI Agent Task: Analyze Training Metrics**
-
-**MANDATORY**: When propensity model training completes, AI agents must:
-
-1. **Read and analyze `training_summary.json`**:
-   ```python
-   # Example analysis approach using actual JSON structure
-   with open('training_summary.json') as f:
-       data = json.load(f)
-
-   metrics = data['data']['metrics']
-   train_metrics = metrics['train']
-   test_metrics = metrics['test']
-   val_metrics = metrics['val']
-
-   # Extract key performance indicators
-   train_roc_auc = train_metrics['roc_auc']
-   test_roc_auc = test_metrics['roc_auc']
-   val_roc_auc = val_metrics['roc_auc']
-
-   train_f1 = train_metrics['f1_score']
-   test_f1 = test_metrics['f1_score']
-
-   # Sample sizes for analysis
-   train_users = train_metrics['users']
-   test_users = test_metrics['users']
-   val_users = val_metrics['users']
-   ```
-
-2. **Analyze metrics and identify ML issues using your expertise**:
-
-   **Use your ML knowledge to assess**:
-   - Model performance quality across train/test/validation splits
-   - Signs of overfitting, underfitting, or data leakage
-   - Dataset balance and size adequacy
-   - Metric appropriateness for the use case
-   - Any other concerning patterns you notice
-
-   **Key metrics available for analysis**:
-   - `roc_auc`, `pr_auc`, `f1_score`, `precision`, `recall` across all splits
-   - Sample sizes: `train_users`, `test_users`, `val_users`
-   - Model type:  (from JSON metadata)
-
-3. **Analyze and explain feature importance**:
-   - **Action**: Reference `01-feature-importance-chart-<model_name>_training.png`
-   - **Tell user**: "Check the feature importance chart - top features are most predictive"
-   - **Guide interpretation**:
-     - High importance features: These strongly predict your target variable
-     - Low importance features: Consider removing to reduce overfitting
-     - Unexpected top features: May indicate data leakage or quality issues
-
-4. **Review other performance charts**:
-   - **Lift Chart** (`02-test-lift-chart-*`): "This shows how much better your model performs vs random selection"
-   - **PR-AUC** (`03-test-pr-auc-*`): "Precision-Recall curve - important for imbalanced datasets"
-   - **ROC-AUC** (`04-test-roc-auc-*`): "Overall discrimination ability - higher is better"
-
-##### 🎯 **Specific Metrics to Report**
-
-AI agents should extract and report these key metrics from `training_summary.json`:
-
-**Core Performance Metrics**:
-- **ROC-AUC**: `train['roc_auc']` vs `test['roc_auc']` vs `val['roc_auc']` (look for >0.10 difference as overfitting signal)
-- **PR-AUC**: `train['pr_auc']` vs `test['pr_auc']` vs `val['pr_auc']` (better for imbalanced datasets)
-- **F1-Score**: `train['f1_score']` vs `test['f1_score']` vs `val['f1_score']` (balanced precision/recall)
-- **Precision**: `test['precision']` (how many predicted positives were correct)
-- **Recall**: `test['recall']` (how many actual positives were found)
-
-**Dataset Characteristics**:
-- **Sample sizes**: `train['users']`, `test['users']`, `val['users']` (check for adequate split sizes)
-- **Total users**: Sum of all splits (should be reasonable for model complexity)
-- **Model type**: `data['task']` (classification/regression) and `data['model']` (XGBClassifier, etc.)
-
-**Apply your ML expertise to identify issues like**:
-- Data leakage indicators (e.g., suspiciously perfect scores)
-- Overfitting patterns (train vs test performance gaps)
-- Underfitting signs (poor performance across all splits)
-- Sample size adequacy for reliable model training
-- Class imbalance effects on different metrics
-
-##### 🔧 **Profiles-Specific Remediation Options**
-
-When you identify ML issues, suggest relevant Profiles configuration changes:
-
-**Model Configuration Parameters** (in `profiles.yaml`):
-
-**Sample Size Controls**:
-```yaml
-training:
-  # Option 1: Increase row limit (only useful if already hitting current limit)
-  max_row_count: 100000        # Default: 30,000. Only increases if current data hits limit
-
-  # Option 2: Advanced - Multiple training snapshots (increases sample size significantly)
-  new_materialisations_config:
-    strategy: manual           # Use multiple historical snapshots for training
-    dates:
-      - '2025-01-01,2025-01-08'  # Format: (feature_date, label_date)
-      - '2025-02-01,2025-02-08'  # Dates must be separated by predict_window_days
-      - '2025-03-01,2025-03-08'  # Add more pairs to increase training data
-```
-
-**Feature & Population Controls**:
-```yaml
-training:
-  eligible_users: "criteria"   # SQL criteria to expand/narrow training population
-  ignore_features:             # Remove problematic features from training
-    - entity/user/feature_name
-
-inputs:
-  - entity/user/new_behavioral_feature  # Add more predictive features
-```
-
-**Key Levers for Sample Size Issues**:
-- **Small datasets**: Use `new_materialisations_config` with multiple date pairs (most effective)
-- **Hit row limits**: Increase `max_row_count` beyond 30,000 default
-- **Wrong population**: Adjust `eligible_users` SQL criteria
-- **Poor features**: Add/remove features in `inputs` section or use `ignore_features`
-
-**📚 For Advanced Configuration**: Use `search_profiles_docs(query="propensity models new_materialisations_config")` to get detailed documentation about historical snapshot training.
-
-**Investigation Steps**:
-- Check feature importance charts to identify top contributors
-- Review `eligible_users` criteria for training population quality
-- Analyze input data for feature correlation and leakage
-- Validate prediction window and target variable definition
-
-#### Prediction Phase Output
-- **Warehouse tables**: Created with scores for each entity
-- **Table naming**: Uses names from `prediction.output_columns` in model config
-- **Feature availability**:
-  - `is_feature: true` → Available in main C360/feature tables
-  - `is_feature: false` → Available in dedicated table named after prediction material
-
-## 🔧 **Troubleshooting Common Issues**
-
-### Empty or Missing Output Folders
-- **Check**: Logs for compilation errors
-- **Verify**: Warehouse permissions and connection
-- **Action**: Run `pb validate access` to check permissions
-
-### Propensity Model Training Skipped
-- **Reason**: Model validity period hasn't expired
-- **Check**: Last training date in logs
-- **Force retrain**: Use appropriate CLI flags if needed
-
-### Missing Feature Tables in Warehouse
-- **Check**: Schema permissions and table creation rights
-- **Verify**: Connection configuration in siteconfig
-- **Action**: Query warehouse directly to confirm table existence
-
-## 📊 **Recommended Next Steps**
-
-1. **Validate warehouse tables**: Query created tables for row counts and schema
-2. **Review feature distributions**: Check for unexpected nulls or outliers
-3. **Test feature views**: Ensure ID-based views work as expected
-4. **Monitor performance**: Check query execution times and resource usage
-5. **Document results**: Record any issues or optimizations for future runs
-
-## 🎯 **For AI Agents: Key Decision Points**
-
-**If standard models only**: Focus on SQL validation and table creation
-**If propensity models included**: Check both training artifacts and prediction tables
-**If errors in logs**: Prioritize error resolution before proceeding
-**If audit fails**: Review identity stitching configuration before continuing
-        """
-        return docs
+        return _load_doc("about_output.md")
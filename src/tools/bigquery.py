@@ -1,14 +1,53 @@
-from typing import Union, List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Union, List, Dict, Set, Tuple
 
 import pandas as pd
 from google.auth import default
+from google.auth.credentials import with_scopes_if_required
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 from google.oauth2 import service_account
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:  # Optional: without it results are downloaded via REST paging
+    bigquery_storage = None
+from requests.adapters import HTTPAdapter
 from logger import setup_logger
 from tools.warehouse_base import BaseWarehouse, WarehouseConnectionDetails
+from utils.ttl_cache import TTLCache
 
 logger = setup_logger(__name__)
 
+# How long table metadata fetched via tables.get is reused before re-fetching
+TABLE_METADATA_TTL_SECONDS = 300
+
+# How long a dataset's table listing is reused before listing it again
+TABLE_LISTING_TTL_SECONDS = 60
+
+# describe_table suffix for each BigQuery field mode
+_MODE_SUFFIX = {
+    "NULLABLE": " (nullable)",
+    "REQUIRED": " (required)",
+    "REPEATED": " (repeated)",
+}
+
+# How long a successful client probe is trusted before ensure_valid_session re-checks
+SESSION_VALIDATION_TTL_SECONDS = 300
+
+# Default keep-alive connection pool shared by all REST calls made through one
+# client; override with pool_connections / pool_maxsize in the connection details
+HTTP_POOL_CONNECTIONS = 20
+HTTP_POOL_MAXSIZE = 50
+
+# Token refresh timeout for the client's authorized session (google-cloud-core's default)
+CREDENTIALS_REFRESH_TIMEOUT_SECONDS = 300
+
+# Upper bound on datasets scanned concurrently by input_table_suggestions
+MAX_SCHEMA_WORKERS = 16
+
 
 class BigQuery(BaseWarehouse):
     """
@@ -21,23 +60,35 @@ class BigQuery(BaseWarehouse):
     def __init__(self):
         super().__init__()
         self.client: bigquery.Client = None
+        self._last_validated_at: float = None
+        self._credentials = None
+        self._bqstorage_client = None
+        self._session_lock = threading.Lock()
+        self._table_cache = TTLCache(
+            maxsize=1024, ttl_seconds=TABLE_METADATA_TTL_SECONDS
+        )
+        self._list_tables_cache = TTLCache(
+            maxsize=256, ttl_seconds=TABLE_LISTING_TTL_SECONDS
+        )
 
     def initialize_connection(self, connection_details: dict) -> None:
         """Initialize a BigQuery connection with provided credentials."""
         logger.info(
-            f"Initializing BigQuery connection for project: {connection_details.get('project_id')}"
+            "Initializing BigQuery connection for project: %s",
+            connection_details.get("project_id"),
         )
         self.connection_details = WarehouseConnectionDetails(connection_details)
+        self._table_cache.clear()
+        self._list_tables_cache.clear()
+        self._last_validated_at = None
         self.create_session()
         self.update_last_used()
 
     def create_session(self) -> bigquery.Client:
         """Create a new BigQuery client with proper authentication handling."""
-        logger.info(
-            f"Creating new BigQuery client for project: {self.connection_details.connection_details.get('project_id')}"
-        )
-
         project_id = self.connection_details.connection_details.get("project_id")
+        logger.info("Creating new BigQuery client for project: %s", project_id)
+
         credentials_dict = self.connection_details.connection_details.get("credentials")
 
         try:
@@ -47,9 +98,6 @@ class BigQuery(BaseWarehouse):
                 credentials = service_account.Credentials.from_service_account_info(
                     credentials_dict
                 )
-                self.client = bigquery.Client(
-                    project=project_id, credentials=credentials
-                )
 
             else:
                 # Fall back to Application Default Credentials (ADC)
@@ -57,15 +105,66 @@ class BigQuery(BaseWarehouse):
                 credentials, default_project = default()
                 # Use provided project_id or fall back to default project
                 project_id = project_id or default_project
-                self.client = bigquery.Client(
-                    project=project_id, credentials=credentials
-                )
+
+            self.client = bigquery.Client(
+                project=project_id,
+                credentials=credentials,
+                _http=self._authorized_session(
+                    credentials, self.connection_details.connection_details
+                ),
+            )
+            # The Storage Read API client is tied to these credentials; drop the
+            # previous session's one and build a new one on the next download
+            self._credentials = credentials
+            self._close_bqstorage_client()
 
         except Exception as e:
             raise Exception(f"Failed to create BigQuery client: {str(e)}")
 
         return self.client
 
+    @staticmethod
+    def _authorized_session(credentials, connection_details: dict) -> AuthorizedSession:
+        """Build the client's authorized HTTP session with a sized keep-alive pool."""
+        # bigquery.Client only scopes credentials for the session it builds itself
+        session = AuthorizedSession(
+            with_scopes_if_required(credentials, bigquery.Client.SCOPE),
+            refresh_timeout=CREDENTIALS_REFRESH_TIMEOUT_SECONDS,
+        )
+        session.configure_mtls_channel()
+        # Leave the mutual TLS adapter untouched when client certificates are in use
+        if session.is_mtls:
+            return session
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=int(
+                    connection_details.get("pool_connections") or HTTP_POOL_CONNECTIONS
+                ),
+                pool_maxsize=int(
+                    connection_details.get("pool_maxsize") or HTTP_POOL_MAXSIZE
+                ),
+            ),
+        )
+        return session
+
+    def _get_bqstorage_client(self):
+        """Return the session's Storage Read API client, creating it on first use."""
+        if bigquery_storage is None:
+            return None
+        with self._session_lock:
+            if self._bqstorage_client is None:
+                self._bqstorage_client = bigquery_storage.BigQueryReadClient(
+                    credentials=self._credentials
+                )
+            return self._bqstorage_client
+
+    def _close_bqstorage_client(self) -> None:
+        """Close the Storage Read API client's gRPC channel, if one was created."""
+        if self._bqstorage_client is not None:
+            self._bqstorage_client.transport.close()
+            self._bqstorage_client = None
+
     def ensure_valid_session(self) -> None:
         """Ensure we have a valid BigQuery client."""
         if self.client is None:
@@ -73,51 +172,75 @@ class BigQuery(BaseWarehouse):
                 "Session is not initialized. Call initialize_warehouse_connection() mcp tool first."
             )
 
-        try:
-            # Test the connection with a simple query
-            query = "SELECT 1 as test_column"
-            query_job = self.client.query(query)
-            query_job.result()  # Wait for the job to complete
-            self.update_last_used()
-
-        except Exception as e:
-            # Client is invalid, create new one
-            logger.warning(f"BigQuery client invalid or expired: {str(e)}")
-            if self.client is not None:
-                self.client.close()
-
-            logger.info("Creating new BigQuery client due to expiration/invalidity")
-            self.client = self.create_session()
+        # bigquery.Client does not expire like a DB connection, so skip the
+        # probe job when the client was validated recently
+        if self._recently_validated():
             self.update_last_used()
+            return
+
+        # Concurrent tool calls share this client; only one of them should probe
+        # and, if needed, rebuild it while the others wait and reuse the result
+        with self._session_lock:
+            if self._recently_validated():
+                self.update_last_used()
+                return
+
+            try:
+                # Test the connection with a simple query
+                query = "SELECT 1 as test_column"
+                query_job = self.client.query(query)
+                query_job.result()  # Wait for the job to complete
+                self._last_validated_at = time.monotonic()
+                self.update_last_used()
+
+            except Exception as e:
+                # Client is invalid, create new one
+                logger.warning("BigQuery client invalid or expired: %s", e)
+                if self.client is not None:
+                    self.client.close()
+
+                logger.info("Creating new BigQuery client due to expiration/invalidity")
+                self.client = self.create_session()
+                self._last_validated_at = time.monotonic()
+                self.update_last_used()
+
+    def _recently_validated(self) -> bool:
+        return (
+            self._last_validated_at is not None
+            and time.monotonic() - self._last_validated_at
+            < SESSION_VALIDATION_TTL_SECONDS
+        )
 
     def raw_query(
         self, query: str, response_type: str = "list"
     ) -> Union[List[Dict], pd.DataFrame]:
         """Execute BigQuery SQL and return results."""
         try:
-            logger.info(f"Executing BigQuery query: {query[:100]}...")
+            logger.info("Executing BigQuery query: %.100s...", query)
             self.ensure_valid_session()
 
             query_job = self.client.query(query)
 
             if response_type == "list":
-                results = []
-                for row in query_job:
-                    # Convert Row to dictionary
-                    row_dict = dict(row)
-                    results.append(row_dict)
-                return results
+                rows = query_job.result()
+                # Resolve column names once and zip them with each row's value tuple,
+                # rather than rebuilding the name->index mapping via dict(row) per row
+                field_names = [field.name for field in rows.schema]
+                return [dict(zip(field_names, row.values())) for row in rows]
 
             elif response_type == "pandas":
                 try:
-                    df = query_job.to_dataframe()
+                    df = query_job.to_dataframe(
+                        bqstorage_client=self._get_bqstorage_client(),
+                        create_bqstorage_client=False,
+                    )
                     # Fill NaN values with 'Null' for object columns (consistent across different warehouses)
-                    for col in df.columns:
-                        if df[col].dtype == "object":
-                            df[col] = df[col].fillna("Null")
+                    object_columns = df.select_dtypes(include="object").columns
+                    if len(object_columns):
+                        df[object_columns] = df[object_columns].fillna("Null")
                     return df
                 except Exception as e:
-                    logger.error(f"Failed to convert query to pandas: {str(e)}")
+                    logger.error("Failed to convert query to pandas: %s", e)
                     # Fall back to list format
                     return self.raw_query(query, response_type="list")
             else:
@@ -135,93 +258,117 @@ class BigQuery(BaseWarehouse):
 
             # In BigQuery, database is project, schema is dataset
             table_ref = f"{database}.{schema}.{table}"
-            table_obj = self.client.get_table(table_ref)
+            table_obj = self._get_table_cached(table_ref)
 
             # Format schema information similar to other warehouse output
-            result = []
-            for field in table_obj.schema:
-                field_info = f"{field.name}: {field.field_type}"
-                if field.mode == "NULLABLE":
-                    field_info += " (nullable)"
-                elif field.mode == "REQUIRED":
-                    field_info += " (required)"
-                elif field.mode == "REPEATED":
-                    field_info += " (repeated)"
-                result.append(field_info)
-
-            return result
+            return [
+                f"{field.name}: {field.field_type}{_MODE_SUFFIX.get(field.mode, '')}"
+                for field in table_obj.schema
+            ]
 
         except Exception as e:
-            logger.error(f"Failed to describe table: {str(e)}")
+            logger.error("Failed to describe table: %s", e)
             return [f"Failed to describe table: {str(e)}"]
 
+    def _get_table_cached(self, table_ref: str) -> bigquery.Table:
+        """Fetch table metadata, reusing results fetched within the TTL window."""
+        return self._table_cache.get_or_load(
+            table_ref, lambda: self.client.get_table(table_ref)
+        )
+
+    def _list_tables_cached(self, dataset_ref: str) -> List[bigquery.table.TableListItem]:
+        """List a dataset's tables, reusing a listing fetched within the TTL window."""
+        return self._list_tables_cache.get_or_load(
+            dataset_ref, lambda: list(self.client.list_tables(dataset_ref))
+        )
+
     def input_table_suggestions(self, database: str, schemas: str) -> List[str]:
         """Suggest relevant tables for profiles input configuration."""
-        default_tables = ["tracks", "pages", "identifies", "screens"]
         schema_list = [schema.strip() for schema in schemas.split(",")]
-        suggestions = []
-
-        def find_matching_tables(
-            schema: str, table_names: List[str], candidates: List[str]
-        ) -> List[str]:
-            """Find tables from the candidates list that exist in table_names (substring match)"""
-            matches = []
-            for candidate in candidates:
-                for t in table_names:
-                    if candidate.lower() in t.lower():
-                        matches.append(f"{database}.{schema}.{t}")
-            return matches
+        suggestions: Set[str] = set()
 
         try:
             self.ensure_valid_session()
 
-            for schema in schema_list:
-                # List tables in the dataset (schema)
-                dataset_ref = f"{database}.{schema}"
-                try:
-                    dataset = self.client.get_dataset(dataset_ref)
-                    tables = list(self.client.list_tables(dataset))
-                    table_names = [table.table_id for table in tables]
+            # Datasets are independent, so list and query them concurrently;
+            # the client releases the GIL while waiting on HTTP
+            max_workers = max(1, min(MAX_SCHEMA_WORKERS, len(schema_list)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._schema_table_suggestions, database, schema)
+                    for schema in schema_list
+                ]
+                for future in as_completed(futures):
+                    suggestions.update(future.result())
 
-                    # Substring match for default tables
-                    suggestions.extend(
-                        find_matching_tables(schema, table_names, default_tables)
+        except Exception as e:
+            logger.error("Error in input table suggestions: %s", e)
+
+        return list(suggestions)
+
+    def _schema_table_suggestions(self, database: str, schema: str) -> Set[str]:
+        """Collect input table suggestions for a single dataset."""
+        default_tables = ["tracks", "pages", "identifies", "screens"]
+        suggestions: Set[str] = set()
+
+        def find_matching_tables(
+            lowered_tables: List[Tuple[str, str]], candidates: List[str]
+        ) -> Iterator[str]:
+            """Find tables from the candidates list that exist in lowered_tables (substring match)"""
+            lowered_candidates = {c.lower() for c in candidates}
+            for t, t_lower in lowered_tables:
+                # One matching candidate is enough to suggest the table
+                if any(candidate in t_lower for candidate in lowered_candidates):
+                    yield f"{database}.{schema}.{t}"
+
+        # List tables in the dataset (schema)
+        dataset_ref = f"{database}.{schema}"
+        try:
+            # list_tables accepts the dataset reference directly and raises
+            # NotFound itself, so no separate get_dataset round trip is needed
+            tables = self._list_tables_cached(dataset_ref)
+            # Lower each name once instead of once per candidate comparison
+            lowered_tables = [(table.table_id, table.table_id.lower()) for table in tables]
+
+            # Substring match for default tables
+            suggestions.update(find_matching_tables(lowered_tables, default_tables))
+
+            # For each table that matches 'tracks' as a substring, get event tables.
+            # client.query() returns as soon as the job is created, so submit every
+            # job first and only then block on results, letting them run in parallel
+            tracks_like_tables = [t for t, t_lower in lowered_tables if "tracks" in t_lower]
+            event_jobs = []
+            for tracks_table in tracks_like_tables:
+                query = f"""
+                SELECT event, COUNT(*) as count 
+                FROM `{database}.{schema}.{tracks_table}` 
+                GROUP BY event 
+                ORDER BY count DESC 
+                LIMIT 20
+                """
+                try:
+                    event_jobs.append((tracks_table, self.client.query(query)))
+                except Exception:
+                    logger.warning(
+                        "Failed to query events from %s.%s", schema, tracks_table
                     )
 
-                    # For each table that matches 'tracks' as a substring, get event tables
-                    tracks_like_tables = [
-                        t for t in table_names if "tracks" in t.lower()
+            for tracks_table, query_job in event_jobs:
+                try:
+                    event_names = [
+                        row["event"] for row in query_job.result() if row.get("event")
                     ]
-                    for tracks_table in tracks_like_tables:
-                        try:
-                            query = f"""
-                            SELECT event, COUNT(*) as count 
-                            FROM `{database}.{schema}.{tracks_table}` 
-                            GROUP BY event 
-                            ORDER BY count DESC 
-                            LIMIT 20
-                            """
-                            rows = self.raw_query(query)
-                            event_names = [
-                                row["event"] for row in rows if row.get("event")
-                            ]
-                            # For each event, check if a table with that event name exists
-                            suggestions.extend(
-                                find_matching_tables(schema, table_names, event_names)
-                            )
-                        except Exception:
-                            logger.warning(
-                                f"Failed to query events from {schema}.{tracks_table}"
-                            )
-
-                except Exception as e:
-                    logger.warning(f"Failed to access dataset {schema}: {str(e)}")
-                    continue
+                    # For each event, check if a table with that event name exists
+                    suggestions.update(find_matching_tables(lowered_tables, event_names))
+                except Exception:
+                    logger.warning(
+                        "Failed to query events from %s.%s", schema, tracks_table
+                    )
 
         except Exception as e:
-            logger.error(f"Error in input table suggestions: {str(e)}")
+            logger.warning("Failed to access dataset %s: %s", schema, e)
 
-        return list(set(suggestions))  # Remove duplicates
+        return suggestions
 
     def _get_bigquery_project_id(self) -> str:
         """Get the BigQuery project ID from connection details."""
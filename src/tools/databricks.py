@@ -1,12 +1,54 @@
-from typing import Union, List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Union, List, Dict, Any, Set, Tuple
 
 import pandas as pd
 from databricks import sql
+from databricks.sql.exc import (
+    DatabaseError,
+    Error,
+    InterfaceError,
+    OperationalError,
+    UnsafeToRetryError,
+)
 from logger import setup_logger
 from tools.warehouse_base import BaseWarehouse, WarehouseConnectionDetails
+from utils.ttl_cache import TTLCache
+
+try:
+    import pyarrow as pa
+except ImportError:  # Optional since connector 4.0; rows are then fetched as tuples
+    pa = None
 
 logger = setup_logger(__name__)
 
+# How long a DESCRIBE TABLE result is reused before describing the table again
+DESCRIBE_CACHE_TTL_SECONDS = 300
+
+# Row caps for metadata queries; wider results are truncated rather than
+# streamed in full
+DESCRIBE_TABLE_MAX_ROWS = 2000
+SHOW_TABLES_MAX_ROWS = 5000
+
+# Upper bounds on schemas scanned concurrently by input_table_suggestions and
+# on concurrent event-count queries within each schema
+MAX_SCHEMA_WORKERS = 8
+MAX_EVENT_QUERY_WORKERS = 8
+
+
+def _is_reconnectable(error: Exception) -> bool:
+    """Whether a cursor()/execute() failure means the connection must be reopened."""
+    if isinstance(error, UnsafeToRetryError):
+        return False
+    if isinstance(error, (OperationalError, InterfaceError)):
+        return True
+    if isinstance(error, DatabaseError):
+        # An expired or invalidated server session comes back as INVALID_HANDLE_STATUS
+        message = str(error)
+        return "Invalid SessionHandle" in message or "INVALID_HANDLE" in message
+    # Connector 2.x raises the base Error from cursor() on a closed connection
+    return type(error) is Error
+
 
 class Databricks(BaseWarehouse):
     """
@@ -20,157 +62,283 @@ class Databricks(BaseWarehouse):
     def __init__(self):
         super().__init__()
         self.session = None  # Renamed from connection for consistency with base class
+        self._catalog: str = None
+        self._unity_catalog = False
+        self._session_lock = threading.Lock()
+        self._describe_cache = TTLCache(
+            maxsize=1024, ttl_seconds=DESCRIBE_CACHE_TTL_SECONDS
+        )
 
     def initialize_connection(self, connection_details: dict) -> None:
-        """Initialize a Databricks connection with provided credentials."""
+        """
+        Store Databricks connection settings; the connection itself is opened lazily.
+
+        The settings are checked up front, but the TLS/OAuth handshake is deferred
+        to the first ensure_valid_session() call so warehouses that are initialized
+        but never queried cost nothing.
+        """
         logger.info(
             f"Initializing Databricks connection for host: {connection_details.get('host')}"
         )
+        self._connect_kwargs(connection_details)
+        if self.session is not None:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+        self.session = None
+        self._describe_cache.clear()
         self.connection_details = WarehouseConnectionDetails(connection_details)
-        self.create_session()
+        # Resolve the catalog once; a non-empty catalog means Unity Catalog
+        # (catalog.schema.table) naming is used for every relation
+        self._catalog = (connection_details.get("catalog") or "").strip() or None
+        self._unity_catalog = self._catalog is not None
         self.update_last_used()
 
-    def create_session(self) -> Any:
-        """Create a new Databricks SQL connection with proper authentication handling."""
-        logger.info(
-            f"Creating new Databricks connection for host: {self.connection_details.connection_details.get('host')}"
-        )
-
+    @staticmethod
+    def _connect_kwargs(connection_details: dict) -> Dict[str, Any]:
+        """Build sql.connect() arguments, picking PAT or M2M OAuth authentication."""
         # Extract connection parameters
-        host = self.connection_details.connection_details.get("host")
-        http_path = self.connection_details.connection_details.get("http_endpoint")
-        catalog = self.connection_details.connection_details.get("catalog")
-        schema = self.connection_details.connection_details.get("schema")
+        host = connection_details.get("host")
+        http_path = connection_details.get("http_endpoint")
+        catalog = connection_details.get("catalog")
+        schema = connection_details.get("schema")
 
         # Authentication parameters
-        access_token = self.connection_details.connection_details.get("access_token")
-        client_id = self.connection_details.connection_details.get("client_id")
-        client_secret = self.connection_details.connection_details.get("client_secret")
+        access_token = connection_details.get("access_token")
+        client_id = connection_details.get("client_id")
+        client_secret = connection_details.get("client_secret")
 
         if not host or not http_path:
             raise Exception(
                 "Host and http_endpoint are required for Databricks connection"
             )
 
-        try:
-            # Determine authentication method
-            if access_token and access_token.strip():
-                # Personal Access Token (PAT) authentication
-                logger.info("Using Personal Access Token (PAT) authentication")
-                self.session = sql.connect(
-                    server_hostname=host,
-                    http_path=http_path,
-                    access_token=access_token,
-                    catalog=catalog if catalog else None,
-                    schema=schema if schema else None,
-                    _enable_connection_pooling=True,  # Enable connection pooling
-                )
-
-            elif (
-                client_id
-                and client_id.strip()
-                and client_secret
-                and client_secret.strip()
-            ):
-                # M2M OAuth authentication
-                logger.info("Using M2M OAuth authentication")
-                self.session = sql.connect(
-                    server_hostname=host,
-                    http_path=http_path,
-                    auth_type="databricks-oauth",
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    catalog=catalog if catalog else None,
-                    schema=schema if schema else None,
-                    _enable_connection_pooling=True,  # Enable connection pooling
-                )
+        kwargs = {
+            "server_hostname": host,
+            "http_path": http_path,
+            "catalog": catalog if catalog else None,
+            "schema": schema if schema else None,
+            "_enable_connection_pooling": True,  # Enable connection pooling
+        }
+
+        # Determine authentication method
+        if access_token and access_token.strip():
+            # Personal Access Token (PAT) authentication
+            kwargs["access_token"] = access_token
+        elif client_id and client_id.strip() and client_secret and client_secret.strip():
+            # M2M OAuth authentication
+            kwargs.update(
+                auth_type="databricks-oauth",
+                client_id=client_id,
+                client_secret=client_secret,
+            )
+        else:
+            raise Exception(
+                "No valid authentication method found. Provide either access_token or both client_id and client_secret"
+            )
+        return kwargs
 
-            else:
-                raise Exception(
-                    "No valid authentication method found. Provide either access_token or both client_id and client_secret"
-                )
+    def create_session(self) -> Any:
+        """Create a new Databricks SQL connection with proper authentication handling."""
+        logger.info(
+            f"Creating new Databricks connection for host: {self.connection_details.connection_details.get('host')}"
+        )
+        kwargs = self._connect_kwargs(self.connection_details.connection_details)
+        if "access_token" in kwargs:
+            logger.info("Using Personal Access Token (PAT) authentication")
+        else:
+            logger.info("Using M2M OAuth authentication")
 
+        try:
+            self.session = sql.connect(**kwargs)
         except Exception as e:
             raise Exception(f"Failed to create Databricks connection: {str(e)}")
+        # Tables may have changed while the previous connection was down
+        self._describe_cache.clear()
 
         return self.session
 
     def ensure_valid_session(self) -> None:
-        """Ensure we have a valid Databricks connection."""
-        if self.session is None:
+        """
+        Ensure we have an open Databricks connection, (re)opening it when needed.
+
+        The connection is not probed with a query here; a connection that was
+        closed locally is reopened, and one dropped or expired on the server is
+        detected by the failing query in raw_query, which reconnects and retries.
+        """
+        if self.connection_details is None:
             raise Exception(
                 "Connection is not initialized. Call initialize_warehouse_connection() mcp tool first."
             )
 
-        try:
-            # Test the connection with a simple query
-            cursor = self.session.cursor()
-            cursor.execute("SELECT 1 as test_column")
-            cursor.fetchall()
-            cursor.close()
-            self.update_last_used()
-
-        except Exception as e:
-            # Connection is invalid, create new one
-            logger.warning(f"Databricks connection invalid or expired: {str(e)}")
-            if self.session is not None:
-                try:
-                    self.session.close()
-                except:
-                    pass
+        if self.session is None or not self.session.open:
+            with self._session_lock:
+                if self.session is None or not self.session.open:
+                    if self.session is not None:
+                        logger.info("Databricks connection is closed, reconnecting")
+                    self.create_session()
+        self.update_last_used()
 
-            logger.info(
-                "Creating new Databricks connection due to expiration/invalidity"
+    def _on_query_error(self, error: Exception, failed_session: Any) -> None:
+        """Reconnect after a query failed because the connection was closed or lost."""
+        with self._session_lock:
+            # Concurrent queries can fail on the same dead connection; only the
+            # first one reconnects, the others retry on the new session
+            if self.session is not failed_session:
+                return
+            logger.warning(
+                f"Databricks connection lost during query, reconnecting: {str(error)}"
             )
+            try:
+                failed_session.close()
+            except Exception:
+                pass
             self.session = self.create_session()
-            self.update_last_used()
+
+    def _qualify(self, schema: str, table: str = None, database: str = None) -> str:
+        """
+        Build a schema or table reference for the active naming mode.
+
+        Unity Catalog uses catalog.schema[.table]. Legacy mode prefixes the
+        database only when it is given and differs from the schema.
+        """
+        if self._unity_catalog:
+            prefix = self._catalog
+        elif database and database.strip() and database != schema:
+            prefix = database
+        else:
+            prefix = None
+        return ".".join(part for part in (prefix, schema, table) if part)
 
     def raw_query(
-        self, query: str, response_type: str = "list"
-    ) -> Union[List[Dict], pd.DataFrame]:
-        """Execute Databricks SQL query and return results."""
+        self, query: str, response_type: str = "list", max_rows: int = None
+    ) -> Union[List[Dict], Dict[str, List], pd.DataFrame, "pa.Table"]:
+        """
+        Execute Databricks SQL query and return results.
+
+        Besides "list" and "pandas", internal metadata queries can use
+        response_type "columns" (dict of column name to values) or "arrow"
+        (the pyarrow.Table as fetched; requires pyarrow). When max_rows is
+        given, at most that many rows are fetched from the server.
+        """
         try:
             logger.info(f"Executing Databricks query: {query[:100]}...")
             self.ensure_valid_session()
 
-            cursor = self.session.cursor()
-            cursor.execute(query)
-
-            if response_type == "list":
-                # Fetch all rows
-                rows = cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description]
-                cursor.close()
-
-                # Convert to list of dictionaries
-                results = [dict(zip(columns, row)) for row in rows]
-                return results
+            if response_type == "arrow" and pa is None:
+                raise Exception(
+                    'response_type "arrow" requires pyarrow, which is not installed'
+                )
 
-            elif response_type == "pandas":
-                try:
-                    # Fetch using Arrow format for better performance
-                    df = cursor.fetchall_arrow().to_pandas()
-                    cursor.close()
-
-                    # Fill NaN values with 'Null' for object columns (consistent across different warehouses)
-                    for col in df.columns:
-                        if df[col].dtype == "object":
-                            df[col] = df[col].fillna("Null")
-                    return df
-                except Exception as e:
-                    logger.error(f"Failed to convert query to pandas: {str(e)}")
-                    # Fall back to list format
-                    cursor.close()
-                    return self.raw_query(query, response_type="list")
-            else:
-                cursor.close()
-                raise Exception(f"Invalid response type: {response_type}")
+            session = self.session
+            try:
+                cursor = self._execute(query, max_rows)
+            except Error as e:
+                if not _is_reconnectable(e):
+                    raise
+                # Connections are not probed up front, so a dropped connection or
+                # expired server session surfaces here; reconnect and retry once.
+                # Only opening the cursor and executing are retried: a failure
+                # while fetching must not run the statement a second time
+                self._on_query_error(e, session)
+                cursor = self._execute(query, max_rows)
+            return self._fetch(cursor, response_type, max_rows)
 
         except Exception as e:
             message = f"Databricks query execution failed: {str(e)}"
             logger.error(message)
             raise Exception(message)
 
+    def _execute(self, query: str, max_rows: int = None) -> Any:
+        """Run a query on a fresh cursor and return the cursor for fetching."""
+        if max_rows:
+            # Size the fetch batch to the cap so it arrives in a single round trip
+            cursor = self.session.cursor(arraysize=max_rows)
+        else:
+            cursor = self.session.cursor()
+        cursor.execute(query)
+        return cursor
+
+    def _fetch(
+        self, cursor: Any, response_type: str, max_rows: int = None
+    ) -> Union[List[Dict], Dict[str, List], pd.DataFrame, "pa.Table"]:
+        """Fetch an executed cursor's results in the requested shape."""
+
+        def fetch_rows() -> List[Any]:
+            return cursor.fetchmany(max_rows) if max_rows else cursor.fetchall()
+
+        def fetch_arrow() -> "pa.Table":
+            return cursor.fetchmany_arrow(max_rows) if max_rows else cursor.fetchall_arrow()
+
+        if response_type == "list" and pa is not None:
+            # The driver receives results as Arrow; convert columnar data to
+            # dicts in C instead of going through per-row Row tuples
+            table = fetch_arrow()
+            cursor.close()
+            return table.to_pylist()
+
+        elif response_type == "columns" and pa is not None:
+            table = fetch_arrow()
+            cursor.close()
+            return table.to_pydict()
+
+        elif response_type == "list":
+            # Fetch all rows
+            rows = fetch_rows()
+            columns = [desc[0] for desc in cursor.description]
+            cursor.close()
+
+            # Convert to list of dictionaries
+            results = [dict(zip(columns, row)) for row in rows]
+            return results
+
+        elif response_type == "columns":
+            # Column name -> list of values, without a dict per row
+            rows = fetch_rows()
+            columns = [desc[0] for desc in cursor.description]
+            cursor.close()
+            return {
+                column: [row[i] for row in rows] for i, column in enumerate(columns)
+            }
+
+        elif response_type == "arrow":
+            # Internal metadata queries read a column or two; skip building
+            # per-row dicts or a DataFrame and hand back the Arrow table
+            table = fetch_arrow()
+            cursor.close()
+            return table
+
+        elif response_type == "pandas" and pa is None:
+            rows = fetch_rows()
+            columns = [desc[0] for desc in cursor.description]
+            cursor.close()
+            df = pd.DataFrame.from_records(rows, columns=columns)
+            object_columns = df.select_dtypes(include="object").columns
+            if len(object_columns):
+                df[object_columns] = df[object_columns].fillna("Null")
+            return df
+
+        elif response_type == "pandas":
+            # Fetch using Arrow format for better performance
+            table = fetch_arrow()
+            cursor.close()
+            try:
+                df = table.to_pandas()
+
+                # Fill NaN values with 'Null' for object columns (consistent across different warehouses)
+                object_columns = df.select_dtypes(include="object").columns
+                if len(object_columns):
+                    df[object_columns] = df[object_columns].fillna("Null")
+                return df
+            except Exception as e:
+                logger.error(f"Failed to convert query to pandas: {str(e)}")
+                # Fall back to list format from the rows already fetched
+                return table.to_pylist()
+        else:
+            cursor.close()
+            raise Exception(f"Invalid response type: {response_type}")
+
     def describe_table(self, database: str, schema: str, table: str) -> List[str]:
         """Describe a Databricks table structure."""
         table_ref = None  # Initialize for error context
@@ -183,43 +351,43 @@ class Databricks(BaseWarehouse):
             if database:
                 self._validate_identifier(database, "database")
 
-            # Check if Unity Catalog is being used (3-level namespace)
-            catalog = self.connection_details.connection_details.get("catalog")
-
-            if catalog and catalog.strip():
-                # Unity Catalog: catalog.schema.table
-                self._validate_identifier(catalog, "catalog")
-                table_ref = f"{catalog}.{schema}.{table}"
-            else:
-                # Legacy: database is used as catalog if provided, otherwise just schema.table
-                if database and database.strip() and database != schema:
-                    table_ref = f"{database}.{schema}.{table}"
-                else:
-                    table_ref = f"{schema}.{table}"
-
-            # Note: Using f-string is safe here as table identifiers come from
-            # trusted sources (siteconfig.yaml) and are validated by warehouse permissions
-            query = f"DESCRIBE TABLE {table_ref}"
-            results = self.raw_query(query)
-
-            # Databricks DESCRIBE TABLE returns columns: col_name, data_type, comment
-            # Filter out rows with missing col_name or data_type
-            return [
-                f"{row['col_name']}: {row.get('data_type', 'UNKNOWN')}"
-                for row in results
-                if row.get("col_name")
-            ]
+            if self._unity_catalog:
+                self._validate_identifier(self._catalog, "catalog")
+            table_ref = self._qualify(schema, table, database)
+
+            # table_ref includes the catalog in Unity Catalog mode; hand out a copy
+            # so callers cannot modify the cached entry
+            return list(
+                self._describe_cache.get_or_load(
+                    table_ref, lambda: self._describe(table_ref)
+                )
+            )
 
         except Exception as e:
             error_context = f" ({table_ref})" if table_ref else ""
             logger.error(f"Failed to describe table{error_context}: {str(e)}")
             return [f"Failed to describe table{error_context}: {str(e)}"]
 
+    def _describe(self, table_ref: str) -> List[str]:
+        """Run DESCRIBE TABLE and format each column as 'name: type'."""
+        # Note: Using f-string is safe here as table identifiers come from
+        # trusted sources (siteconfig.yaml) and are validated by warehouse permissions
+        query = f"DESCRIBE TABLE {table_ref}"
+        # "columns" reads Arrow when pyarrow is installed and rows otherwise
+        results = self.raw_query(
+            query, response_type="columns", max_rows=DESCRIBE_TABLE_MAX_ROWS
+        )
+
+        # Databricks DESCRIBE TABLE returns columns: col_name, data_type, comment
+        # Filter out rows with missing col_name
+        names = results.get("col_name", [])
+        types = results.get("data_type", ["UNKNOWN"] * len(names))
+        return [f"{name}: {data_type}" for name, data_type in zip(names, types) if name]
+
     def input_table_suggestions(self, database: str, schemas: str) -> List[str]:
         """Suggest relevant tables for profiles input configuration."""
-        default_tables = ["tracks", "pages", "identifies", "screens"]
         schema_list = [s.strip() for s in schemas.split(",")]
-        suggestions = []
+        suggestions: Set[str] = set()
 
         # Validate identifiers to prevent SQL injection
         if database:
@@ -227,96 +395,111 @@ class Databricks(BaseWarehouse):
         for schema in schema_list:
             self._validate_identifier(schema, "schema")
 
-        # Check if Unity Catalog is being used
-        catalog = self.connection_details.connection_details.get("catalog")
-        if catalog and catalog.strip():
-            self._validate_identifier(catalog, "catalog")
+        if self._unity_catalog:
+            self._validate_identifier(self._catalog, "catalog")
+
+        try:
+            self.ensure_valid_session()
+
+            # Schemas are independent, so list and query them concurrently;
+            # every query opens its own cursor on the shared connection
+            max_workers = max(1, min(MAX_SCHEMA_WORKERS, len(schema_list)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._schema_table_suggestions, database, schema)
+                    for schema in schema_list
+                ]
+                for future in as_completed(futures):
+                    suggestions.update(future.result())
+
+        except Exception as e:
+            logger.error(f"Error in input table suggestions: {str(e)}")
+
+        return list(suggestions)
+
+    def _schema_table_suggestions(self, database: str, schema: str) -> Set[str]:
+        """Collect input table suggestions for a single schema."""
+        default_tables = ["tracks", "pages", "identifies", "screens"]
+        suggestions: Set[str] = set()
 
         def find_matching_tables(
-            schema: str, table_names: List[str], candidates: List[str]
-        ) -> List[str]:
-            """Find tables from the candidates list that exist in table_names (substring match)"""
-            matches = []
-            for candidate in candidates:
-                for t in table_names:
-                    if candidate.lower() in t.lower():
-                        if catalog and catalog.strip():
-                            # Unity Catalog: catalog.schema.table
-                            matches.append(f"{catalog}.{schema}.{t}")
-                        else:
-                            # Legacy: database.schema.table or schema.table
-                            if database and database.strip() and database != schema:
-                                matches.append(f"{database}.{schema}.{t}")
-                            else:
-                                matches.append(f"{schema}.{t}")
-            return matches
+            lowered_tables: List[Tuple[str, str]], candidates: List[str]
+        ) -> Iterator[str]:
+            """Find tables from the candidates list that exist in lowered_tables (substring match)"""
+            lowered_candidates = {c.lower() for c in candidates}
+            for t, t_lower in lowered_tables:
+                # One matching candidate is enough to suggest the table
+                if any(candidate in t_lower for candidate in lowered_candidates):
+                    yield self._qualify(schema, t, database)
+
+        def top_events_query(tracks_table: str) -> str:
+            return f"""
+            SELECT event, COUNT(*) as count
+            FROM {self._qualify(schema, tracks_table, database)}
+            GROUP BY event
+            ORDER BY count DESC
+            LIMIT 20
+            """
+
+        def top_event_names(tracks_tables: List[str]) -> List[str]:
+            # Several tracks tables are fused into one UNION ALL statement so the
+            # schema costs a single round trip however many there are
+            query = "\nUNION ALL\n".join(
+                f"({top_events_query(t)})" for t in tracks_tables
+            )
+            events = self.raw_query(query, response_type="columns").get("event") or []
+            return [event for event in events if event]
 
         try:
-            self.ensure_valid_session()
+            # List tables in the schema
+            query = f"SHOW TABLES IN {self._qualify(schema, database=database)}"
+            tables = self.raw_query(
+                query, response_type="columns", max_rows=SHOW_TABLES_MAX_ROWS
+            )
+            table_names = [
+                t for t in tables.get("tableName") or tables.get("table") or [] if t
+            ]
+            # Lower each name once instead of once per candidate comparison
+            lowered_tables = [(t, t.lower()) for t in table_names]
 
-            for schema in schema_list:
-                # Determine the schema reference based on Unity Catalog or legacy
-                if catalog and catalog.strip():
-                    schema_ref = f"{catalog}.{schema}"
-                elif database and database.strip() and database != schema:
-                    schema_ref = f"{database}.{schema}"
-                else:
-                    schema_ref = schema
+            # Substring match for default tables
+            suggestions.update(find_matching_tables(lowered_tables, default_tables))
 
+            # For each table that matches 'tracks' as a substring, get event tables
+            tracks_like_tables = [t for t, t_lower in lowered_tables if "tracks" in t_lower]
+            event_names = None
+            if len(tracks_like_tables) > 1:
                 try:
-                    # List tables in the schema
-                    query = f"SHOW TABLES IN {schema_ref}"
-                    tables = self.raw_query(query)
-                    table_names = [
-                        table.get("tableName") or table.get("table")
-                        for table in tables
-                        if table.get("tableName") or table.get("table")
-                    ]
-
-                    # Substring match for default tables
-                    suggestions.extend(
-                        find_matching_tables(schema, table_names, default_tables)
+                    event_names = top_event_names(tracks_like_tables)
+                except Exception as e:
+                    # One unreadable table fails the whole statement; retry per table
+                    logger.info(
+                        f"Combined event query failed for schema {schema}, querying tables individually: {str(e)}"
                     )
 
-                    # For each table that matches 'tracks' as a substring, get event tables
-                    tracks_like_tables = [
-                        t for t in table_names if "tracks" in t.lower()
-                    ]
-                    for tracks_table in tracks_like_tables:
+            if event_names is not None:
+                # For each event, check if a table with that event name exists
+                suggestions.update(find_matching_tables(lowered_tables, event_names))
+            elif tracks_like_tables:
+                # The queries are independent, so run them concurrently
+                max_workers = min(MAX_EVENT_QUERY_WORKERS, len(tracks_like_tables))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(top_event_names, [tracks_table]): tracks_table
+                        for tracks_table in tracks_like_tables
+                    }
+                    for future in as_completed(futures):
                         try:
-                            # Build full table reference
-                            if catalog and catalog.strip():
-                                full_table_ref = f"{catalog}.{schema}.{tracks_table}"
-                            elif database and database.strip() and database != schema:
-                                full_table_ref = f"{database}.{schema}.{tracks_table}"
-                            else:
-                                full_table_ref = f"{schema}.{tracks_table}"
-
-                            query = f"""
-                            SELECT event, COUNT(*) as count
-                            FROM {full_table_ref}
-                            GROUP BY event
-                            ORDER BY count DESC
-                            LIMIT 20
-                            """
-                            rows = self.raw_query(query)
-                            event_names = [
-                                row["event"] for row in rows if row.get("event")
-                            ]
                             # For each event, check if a table with that event name exists
-                            suggestions.extend(
-                                find_matching_tables(schema, table_names, event_names)
+                            suggestions.update(
+                                find_matching_tables(lowered_tables, future.result())
                             )
                         except Exception:
                             logger.warning(
-                                f"Failed to query events from {schema}.{tracks_table}"
+                                f"Failed to query events from {schema}.{futures[future]}"
                             )
 
-                except Exception as e:
-                    logger.warning(f"Failed to access schema {schema}: {str(e)}")
-                    continue
-
         except Exception as e:
-            logger.error(f"Error in input table suggestions: {str(e)}")
+            logger.warning(f"Failed to access schema {schema}: {str(e)}")
 
-        return list(set(suggestions))  # Remove duplicates
+        return suggestions
@@ -1,9 +1,18 @@
 from utils.rag_search_api import RAGSearchAPIClient
+from utils.ttl_cache import TTLCache
+
+# Repeated searches within this window are answered without calling the RAG API
+DOCS_QUERY_TTL_SECONDS = 3600
 
 
 class Docs:
     def __init__(self):
         self.search_client = RAGSearchAPIClient()
+        self._query_cache = TTLCache(maxsize=256, ttl_seconds=DOCS_QUERY_TTL_SECONDS)
 
     def query(self, query: str) -> list[str]:
-        return self.search_client.search(query)
+        results = self._query_cache.get_or_load(
+            query, lambda: self.search_client.search(query)
+        )
+        # Copy so callers cannot modify the cached results
+        return list(results)
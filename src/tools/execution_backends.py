@@ -668,9 +668,9 @@ class PbQueryExecutionBackend(WarehouseExecutionBackend):
         if response_type == "list":
             return df.to_dict(orient="records")
         if response_type == "pandas":
-            for col in df.columns:
-                if df[col].dtype == "object":
-                    df[col] = df[col].fillna("Null")
+            object_columns = df.select_dtypes(include="object").columns
+            if len(object_columns):
+                df[object_columns] = df[object_columns].fillna("Null")
             return df
         raise ValueError(f"Invalid response_type: {response_type}")
 
@@ -1,9 +1,11 @@
+import copy
 import datetime
-import glob
+import functools
 import json
 import os
 import re
 import shutil
+import stat
 import subprocess
 
 from utils.pb_models_parser import PBModelsParser
@@ -17,6 +19,29 @@ from utils.environment import is_cloud_based_environment
 
 logger = setup_logger(__name__)
 
+# libyaml-backed loader when PyYAML was built with it; same safe semantics and
+# yaml.YAMLError hierarchy as yaml.safe_load, several times faster
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int):
+    # mtime_ns and size are only part of the cache key, so an edited file is re-read
+    # libyaml detects the encoding (UTF-8/UTF-16 BOM) itself when given bytes
+    with open(path, "rb") as file:
+        return yaml.load(file, Loader=_YAML_LOADER)
+
+
+def _load_yaml(path: str):
+    """
+    Parse a YAML file, reusing the result while the file is unchanged on disk.
+
+    Returns a deep copy so callers can modify the result without affecting the cache.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return copy.deepcopy(_load_yaml_cached(path, st.st_mtime_ns, st.st_size))
+
 
 def str_presenter(dumper, data):
     if data.count("\n") > 0:
@@ -27,9 +52,41 @@ def str_presenter(dumper, data):
     return dumper.represent_scalar("tag:yaml.org,2002:str", data)
 
 
+def _walk_yaml_files(root: str):
+    """
+    Yield (path, file_name, size_bytes) for every .yaml/.yml file below root.
+
+    A single os.scandir walk reusing each entry's stat; like the recursive glob it
+    replaces, hidden entries are skipped, symlinked directories are followed and
+    unreadable directories are ignored. Directories already visited (by device
+    and inode) are not scanned again, so symlink cycles terminate.
+    """
+    stack = [root]
+    visited = set()
+    while stack:
+        dir_path = stack.pop()
+        try:
+            dir_stat = os.stat(dir_path)
+            dir_key = (dir_stat.st_dev, dir_stat.st_ino)
+            if dir_key in visited:
+                continue
+            visited.add(dir_key)
+            with os.scandir(dir_path) as scanned:
+                entries = list(scanned)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                stack.append(entry.path)
+            elif entry.name.endswith((".yaml", ".yml")) and entry.is_file():
+                yield entry.path, entry.name, entry.stat().st_size
+
+
 class ProfilesTools:
     # Pre-compiled fake name patterns for performance
-    FAKE_NAME_PATTERNS = {
+    FAKE_NAME_PATTERNS = frozenset({
         "my_database",
         "my_schema",
         "my_table",
@@ -47,6 +104,27 @@ class ProfilesTools:
         "connection_name",
         "user_confirmed",
         "user_chosen",  # Even these placeholders should be replaced
+    })
+    # Single-pass substring scan for any of the patterns above
+    _FAKE_NAME_RE = re.compile(
+        "|".join(map(re.escape, sorted(FAKE_NAME_PATTERNS, key=len, reverse=True)))
+    )
+
+    # ANSI color/cursor escape sequences emitted by pb on a terminal
+    _ANSI_RE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
+
+    # workflow_guide action -> name of the method that handles it
+    _ACTION_HANDLERS = {
+        "start": "_handle_start_action",
+        "knowledge_gathering": "_handle_knowledge_gathering_action",
+        "discover_resources": "_handle_discover_resources_action",
+        "create_inputs_yaml": "_handle_create_inputs_yaml_action",
+        "create_models_yaml": "_handle_create_models_yaml_action",
+        "create_entity_vars": "_handle_create_entity_vars_action",
+        "add_date_filtering": "_handle_add_date_filtering_action",
+        "run_pilot_test": "_handle_run_pilot_test_action",
+        "create_propensity_model": "_handle_create_propensity_model_action",
+        "analyze_existing_project": "_handle_analyze_existing_project_action",
     }
 
     def __init__(self):
@@ -109,8 +187,9 @@ class ProfilesTools:
         Returns:
             dict: Project structure analysis including found files, directories, and metadata
         """
+        project_abs_path = os.path.abspath(project_path)
         analysis = {
-            "project_path": os.path.abspath(project_path),
+            "project_path": project_abs_path,
             "pb_project_found": False,
             "pb_project_config": {},
             "model_folders": [],
@@ -120,16 +199,16 @@ class ProfilesTools:
             "warnings": [],
         }
 
-        project_abs_path = os.path.abspath(project_path)
-
-        # Check if project directory exists
-        if not os.path.exists(project_abs_path):
+        # Check if project directory exists; one stat answers both checks
+        try:
+            project_stat = os.stat(project_abs_path)
+        except OSError:
             analysis["errors"].append(
                 f"Project directory does not exist: {project_abs_path}"
             )
             return analysis
 
-        if not os.path.isdir(project_abs_path):
+        if not stat.S_ISDIR(project_stat.st_mode):
             analysis["errors"].append(f"Path is not a directory: {project_abs_path}")
             return analysis
 
@@ -137,7 +216,12 @@ class ProfilesTools:
             # Step 1: Look for pb_project.yaml in the base directory
             pb_project_path = os.path.join(project_abs_path, "pb_project.yaml")
 
-            if not os.path.exists(pb_project_path):
+            try:
+                pb_project_size = os.stat(pb_project_path).st_size
+            except OSError:
+                pb_project_size = None
+
+            if pb_project_size is None:
                 analysis["warnings"].append(
                     "pb_project.yaml not found. This might be a new/greenfield project."
                 )
@@ -154,21 +238,22 @@ class ProfilesTools:
             analysis["yaml_files"]["pb_project"] = {
                 "path": pb_project_path,
                 "relative_path": "pb_project.yaml",
-                "size_bytes": os.path.getsize(pb_project_path),
+                "size_bytes": pb_project_size,
                 "type": "project_config",
             }
 
             # Step 2: Parse pb_project.yaml to get model_folders
             try:
-                with open(pb_project_path, "r", encoding="utf-8") as f:
-                    file_content = f.read().strip()
+                with open(pb_project_path, "rb") as f:
+                    file_content = f.read()
 
-                    # Check for empty file
-                    if not file_content:
+                    # Check for empty file; the unstripped bytes are parsed since
+                    # stripping can split a UTF-16 code unit
+                    if not file_content.strip():
                         analysis["errors"].append("pb_project.yaml is empty.")
                         return analysis
 
-                    pb_config = yaml.safe_load(file_content)
+                    pb_config = yaml.load(file_content, Loader=_YAML_LOADER)
                     analysis["pb_project_config"] = pb_config or {}
 
                     # Extract model_folders from configuration
@@ -218,7 +303,6 @@ class ProfilesTools:
                 return analysis
 
             # Step 3: Scan the specified model_folders for YAML files
-            yaml_patterns = ["*.yaml", "*.yml"]
             found_yamls = []
 
             for model_folder in analysis["model_folders"]:
@@ -226,7 +310,10 @@ class ProfilesTools:
                 if model_folder.strip().startswith("#"):
                     continue
 
-                folder_path = os.path.join(project_abs_path, model_folder)
+                # Normalized so "./models" and "models/" yield the same paths
+                folder_path = os.path.normpath(
+                    os.path.join(project_abs_path, model_folder)
+                )
                 if not os.path.exists(folder_path):
                     analysis["warnings"].append(
                         f"Model folder does not exist: {model_folder}"
@@ -242,17 +329,17 @@ class ProfilesTools:
                 analysis["scanned_directories"].append(model_folder)
 
                 # Recursively find YAML files in this model folder
-                for pattern in yaml_patterns:
-                    folder_yamls = glob.glob(
-                        os.path.join(folder_path, "**", pattern), recursive=True
-                    )
-                    found_yamls.extend(folder_yamls)
+                found_yamls.extend(_walk_yaml_files(folder_path))
 
             # Step 4: Categorize YAML files found in model folders
-            for yaml_file in found_yamls:
-                rel_path = os.path.relpath(yaml_file, project_abs_path)
-                file_name = os.path.basename(yaml_file)
-                file_size = os.path.getsize(yaml_file)
+            project_prefix = os.path.join(project_abs_path, "")
+            for yaml_file, file_name, file_size in found_yamls:
+                if yaml_file.startswith(project_prefix):
+                    # Files under the project root only need the prefix cut off
+                    rel_path = yaml_file[len(project_prefix) :]
+                else:
+                    # Model folders may point outside the project (e.g. "../shared")
+                    rel_path = os.path.relpath(yaml_file, project_abs_path)
 
                 analysis["yaml_files"][rel_path] = {
                     "path": yaml_file,
@@ -289,57 +376,52 @@ class ProfilesTools:
 
     def get_existing_connections(self) -> list[str]:
         try:
-            with open(PB_SITE_CONFIG_PATH, "r") as file:
-                config = yaml.safe_load(file)
-                connections = config["connections"]
-                return list(connections.keys())
+            config = _load_yaml(PB_SITE_CONFIG_PATH)
+            connections = config["connections"]
+            return list(connections.keys())
         except Exception as e:
             return f"Unable to read siteconfig.yaml file: {e}. Please run `pb init connection` to create a connection."
 
     def get_profiles_output_schema(self, pb_project_file_path: str) -> str:
-        with open(pb_project_file_path, "r") as file:
-            pb_project_config = yaml.safe_load(file)
-            connection_name = pb_project_config["connection"]
+        pb_project_config = _load_yaml(pb_project_file_path)
+        connection_name = pb_project_config["connection"]
         try:
-            with open(PB_SITE_CONFIG_PATH, "r") as file:
-                config = yaml.safe_load(file)
-                connection_config = config["connections"][connection_name]
-                output_schema = connection_config["outputs"][
-                    connection_config["target"]
-                ]["schema"]
-                output_db = connection_config["outputs"][connection_config["target"]][
-                    "dbname"
-                ]
+            config = _load_yaml(PB_SITE_CONFIG_PATH)
+            connection_config = config["connections"][connection_name]
+            output_schema = connection_config["outputs"][
+                connection_config["target"]
+            ]["schema"]
+            output_db = connection_config["outputs"][connection_config["target"]][
+                "dbname"
+            ]
             return f"{output_db.upper()}.{output_schema.upper()}"
         except Exception as e:
             return f"Unable to read siteconfig.yaml file: {e}"
 
     def extract_json_from_output(self, text):
         # Remove ANSI color codes (optional but recommended)
-        ansi_escape = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
-        clean_text = ansi_escape.sub("", text)
+        clean_text = self._ANSI_RE.sub("", text)
 
         # Find the first '{'
         start = clean_text.find("{")
         if start == -1:
             raise ValueError("No JSON object found in output.")
 
-        # Use brace counting to find the matching '}'
-        brace_count = 0
-        for i in range(start, len(clean_text)):
-            if clean_text[i] == "{":
-                brace_count += 1
-            elif clean_text[i] == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    end = i + 1
-                    break
-        else:
-            raise ValueError("No matching closing brace found for JSON object.")
-
-        json_str = clean_text[start:end]
+        # Decode the object starting there; anything after it (trailing logs) is
+        # ignored, and braces inside JSON strings are handled by the parser
+        obj, _ = json.JSONDecoder().raw_decode(clean_text, start)
+        return obj
 
-        return json.loads(json_str)
+    def _parse_models_output(self, pb_response: str) -> dict:
+        """Parse saved `pb show models` output, which may be bare JSON or JSON within logs."""
+        try:
+            # Output redirected without logs is plain JSON; parse it directly
+            models_details = json.loads(pb_response)
+            if isinstance(models_details, dict):
+                return models_details
+        except ValueError:
+            pass
+        return self.extract_json_from_output(pb_response)
 
     def get_profiles_models_details(
         self, pb_project_file_path: str, pb_show_models_output_file_path: str
@@ -349,35 +431,33 @@ class ProfilesTools:
         with open(pb_show_models_output_file_path, "r") as file:
             pb_response = file.read()
         try:
-            models_details = self.extract_json_from_output(pb_response)
+            models_details = self._parse_models_output(pb_response)
         except Exception as e:
             logger.error(f"Error extracting JSON from output: {e}")
             error_message = f"Unable to parse the pb show models output file due to some error in parsing the JSON: {e}. Please check the output file for any detailed logs that can help with the error"
             return {"error": error_message}
-        for _, model_info in models_details.items():
-            if model_info.get("model_type") == "feature_view":
+        for model_info in models_details.values():
+            model_type = model_info.get("model_type")
+            if model_type == "feature_view":
                 entity_name = model_info.get("model_path").split("/")[0]
-                if entity_name not in tables_info:
-                    tables_info[entity_name] = {"feature_views": [], "id_stitcher": ""}
-                tables_info[entity_name]["feature_views"].append(
+                entity_info = tables_info.setdefault(
+                    entity_name, {"feature_views": [], "id_stitcher": ""}
+                )
+                entity_info["feature_views"].append(
                     f"{output_schema}.{model_info['material_name'].upper()}"
                 )
-            elif model_info.get("model_type") == "id_stitcher":
+            elif model_type == "id_stitcher":
                 entity_name = model_info["model_path"].split("/")[0]
                 if entity_name == "models":
                     continue
-                if entity_name not in tables_info:
-                    tables_info[entity_name] = {"feature_views": [], "id_stitcher": ""}
+                entity_info = tables_info.setdefault(
+                    entity_name, {"feature_views": [], "id_stitcher": ""}
+                )
                 id_stitcher_name = model_info["material_name"].upper()
-                if (
-                    "DEFAULT" not in id_stitcher_name
-                    or tables_info[entity_name]["id_stitcher"] == ""
-                ):
+                if "DEFAULT" not in id_stitcher_name or entity_info["id_stitcher"] == "":
                     # Capture the id stitcher name if it's not captured yet. If it's already captured, overwrite if the original one was the default id-stitcher
                     # An underlying assumption here is that an entity can have max two id-stitchers, one with 'default' in the name and one without.
-                    tables_info[entity_name][
-                        "id_stitcher"
-                    ] = f"{output_schema}.{id_stitcher_name}"
+                    entity_info["id_stitcher"] = f"{output_schema}.{id_stitcher_name}"
         response = {"output_schema": output_schema, "tables_info": tables_info}
         return response
 
@@ -388,7 +468,7 @@ class ProfilesTools:
         1. Ensure the project directory exists.
         2. Verify Python 3.10 is installed.
         3. Create a Python virtual environment (unless running in kubernetes pod environment).
-        4. Install the profiles-rudderstack package using pip (unless running in kubernetes pod).
+        4. Install the profiles-rudderstack and profiles_mlcorelib packages using pip (unless running in kubernetes pod).
         5. Return a status dict with messages and errors.
         """
         messages = []
@@ -419,14 +499,17 @@ class ProfilesTools:
         def check_python_version(executable_path: str) -> bool:
             try:
                 result = subprocess.run(
-                    [executable_path, "-c", "import sys; print(sys.version_info[:2])"],
+                    [
+                        executable_path,
+                        "-c",
+                        "import json, sys; print(json.dumps(sys.version_info[:2]))",
+                    ],
                     capture_output=True,
                     text=True,
                     check=True,
                 )
-                version_str = result.stdout.strip()
-                # Parse the output which looks like "(3, 10)"
-                version_tuple = eval(version_str)
+                # Parse the output which looks like "[3, 10]"
+                version_tuple = json.loads(result.stdout)
                 if version_tuple[0] != 3 or version_tuple[1] != 10:
                     errors.append(
                         f"Python version {version_tuple[0]}.{version_tuple[1]} detected. Python 3.10 is required."
@@ -442,15 +525,14 @@ class ProfilesTools:
             messages.append(f"Attempting: {desc}")
             messages.append(f"Executing: `{' '.join(command)}` in `{cwd}`")
             logger.info(f"Running command: {command}")
-            current_env = os.environ.copy()
             try:
+                # The child inherits this process's environment as is (env=None)
                 process = subprocess.run(
                     command,
                     cwd=cwd,
                     check=True,
                     capture_output=True,
                     text=True,
-                    env=current_env,
                 )
                 messages.append(f"Successfully executed: `{' '.join(command)}`.")
                 if process.stdout.strip():
@@ -521,20 +603,18 @@ class ProfilesTools:
                     "pre_check": lambda: os.path.isdir(venv_path),
                 },
                 {
-                    "cmd": [venv_pip_to_use, "install", "profiles-rudderstack"],
-                    "desc": "Install 'profiles-rudderstack' package using pip",
-                    "success_message": "Package 'profiles-rudderstack' installed in the virtual environment",
-                    "pre_check": lambda: os.path.exists(venv_pb),
-                    "skip_message": f"Package 'profiles-rudderstack' already installed in the virtual environment at '{venv_pb}'",
-                },
-                {
-                    "cmd": [venv_pip_to_use, "install", "profiles_mlcorelib"],
-                    "desc": "Install 'profiles_mlcorelib' package using pip",
-                    "success_message": "Package 'profiles_mlcorelib' installed in the virtual environment",
-                    "pre_check": lambda: self._check_package_installed(
-                        venv_bin_dir, "profiles_mlcorelib"
-                    ),
-                    "skip_message": f"Package 'profiles_mlcorelib' already installed in the virtual environment",
+                    # One pip run resolves both packages together
+                    "cmd": [
+                        venv_pip_to_use,
+                        "install",
+                        "profiles-rudderstack",
+                        "profiles_mlcorelib",
+                    ],
+                    "desc": "Install 'profiles-rudderstack' and 'profiles_mlcorelib' packages using pip",
+                    "success_message": "Packages 'profiles-rudderstack' and 'profiles_mlcorelib' installed in the virtual environment",
+                    "pre_check": lambda: os.path.exists(venv_pb)
+                    and self._check_package_installed(venv_bin_dir, "profiles_mlcorelib"),
+                    "skip_message": f"Packages 'profiles-rudderstack' and 'profiles_mlcorelib' already installed in the virtual environment at '{venv_path}'",
                 },
             ]
 
@@ -615,12 +695,20 @@ For more information, refer to the RudderStack Profiles documentation.
         }
 
     def _check_package_installed(self, venv_bin_dir: str, package_name: str) -> bool:
-        """Check if a Python package is installed in the virtual environment by trying to import it."""
+        """Check if a Python package is installed in the virtual environment."""
         python_path = os.path.join(venv_bin_dir, "python")
+        # Isolated mode (-I) skips site customization and user site-packages, and
+        # find_spec locates the package without importing it
+        program = (
+            "import importlib.util, sys; "
+            "sys.exit(importlib.util.find_spec(sys.argv[1]) is None)"
+        )
         try:
-            # Try to import the package in the virtual environment
-            cmd = [python_path, "-c", f"import {package_name}"]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(
+                [python_path, "-I", "-c", program, package_name],
+                capture_output=True,
+                text=True,
+            )
             return result.returncode == 0
         except Exception:
             return False
@@ -722,22 +810,9 @@ For more information, refer to the RudderStack Profiles documentation.
             return self._merge_validation_results(guide, user_validation)
 
         # Route to specific action handler
-        action_handlers = {
-            "start": self._handle_start_action,
-            "knowledge_gathering": self._handle_knowledge_gathering_action,
-            "discover_resources": self._handle_discover_resources_action,
-            "create_inputs_yaml": self._handle_create_inputs_yaml_action,
-            "create_models_yaml": self._handle_create_models_yaml_action,
-            "create_entity_vars": self._handle_create_entity_vars_action,
-            "add_date_filtering": self._handle_add_date_filtering_action,
-            "run_pilot_test": self._handle_run_pilot_test_action,
-            "create_propensity_model": self._handle_create_propensity_model_action,
-            "analyze_existing_project": self._handle_analyze_existing_project_action,
-        }
-
-        handler = action_handlers.get(current_action)
-        if handler:
-            return handler(
+        handler_name = self._ACTION_HANDLERS.get(current_action)
+        if handler_name:
+            return getattr(self, handler_name)(
                 guide,
                 user_goal,
                 user_confirmed_tables,
@@ -1262,11 +1337,9 @@ For more information, refer to the RudderStack Profiles documentation.
         if current_action not in config_actions:
             return {"valid": True}
 
-        # Detection of fake/generic names using optimized set intersection
+        # Detection of fake/generic names anywhere in the text
         def detect_fake_names(text):
-            text_lower = text.lower()
-            # Use set intersection for O(1) average case lookup
-            return any(pattern in text_lower for pattern in self.FAKE_NAME_PATTERNS)
+            return self._FAKE_NAME_RE.search(text.lower()) is not None
 
         # Check for missing user confirmed data
         if not user_confirmed_tables.strip():
@@ -1514,8 +1587,7 @@ For more information, refer to the RudderStack Profiles documentation.
             dict: Connection details with credentials or error status
         """
         try:
-            with open(PB_SITE_CONFIG_PATH, "r") as file:
-                config = yaml.safe_load(file) or {}
+            config = _load_yaml(PB_SITE_CONFIG_PATH) or {}
 
             if "connections" not in config:
                 return {
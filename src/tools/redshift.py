@@ -301,9 +301,9 @@ class Redshift(BaseWarehouse):
                 df = pd.DataFrame(rows, columns=columns)
 
                 # Fill NaN values with 'Null' for object columns (consistent across different warehouses)
-                for col in df.columns:
-                    if df[col].dtype == "object":
-                        df[col] = df[col].fillna("Null")
+                object_columns = df.select_dtypes(include="object").columns
+                if len(object_columns):
+                    df[object_columns] = df[object_columns].fillna("Null")
                 return df
             else:
                 raise Exception(f"Invalid response type: {response_type}")
@@ -145,9 +145,9 @@ class Snowflake(BaseWarehouse):
             elif response_type == "pandas":
                 try:
                     df = result.toPandas()
-                    for col in df.columns:
-                        if df[col].dtype == "object":
-                            df[col] = df[col].fillna("Null")
+                    object_columns = df.select_dtypes(include="object").columns
+                    if len(object_columns):
+                        df[object_columns] = df[object_columns].fillna("Null")
                     return df
                 except Exception as e:
                     logger.error(f"Failed to convert query to pandas: {str(e)}")
@@ -4,6 +4,10 @@ from typing import Union, List, Dict, Any
 import re
 import pandas as pd
 
+# Characters allowed in identifiers interpolated into SQL; see
+# BaseWarehouse._validate_identifier
+_SAFE_IDENTIFIER_RE = re.compile(r"[a-zA-Z0-9_.$-]+")
+
 
 class WarehouseConnectionDetails:
     """Data class for warehouse connection details."""
@@ -72,7 +76,7 @@ class BaseWarehouse(ABC):
         # Allow alphanumeric, underscore, dot, dollar sign, and hyphen.
         # Hyphen is safe: SQL comments require `--` followed by whitespace or
         # end-of-line, and the full-string anchor ensures no such context exists.
-        if not re.match(r"^[a-zA-Z0-9_.$-]+$", identifier):
+        if not _SAFE_IDENTIFIER_RE.fullmatch(identifier):
             raise ValueError(
                 f"Invalid {identifier_type} '{identifier}': contains unsafe characters. "
                 f"Only alphanumeric characters, underscores, dots, dollar signs, "
@@ -0,0 +1,36 @@
+from tools.about import About, _load_doc
+
+
+def test_markdown_docs_are_loaded_from_resource_files():
+    about = About()
+
+    assert about.about_macros().startswith("# Macros in Profiles")
+    assert about.about_profiles_output().startswith("# 🔍 Post-Run Validation")
+    assert about.get_about_info("macros") == about.about_macros()
+
+
+def test_markdown_docs_are_read_once():
+    _load_doc.cache_clear()
+    About().about_profiles_output()
+    About().about_profiles_output()
+
+    assert _load_doc.cache_info().misses == 1
+
+
+def test_pb_cli_doc_is_rendered_once_per_environment(monkeypatch):
+    About._render_pb_cli.cache_clear()
+    about = About()
+
+    monkeypatch.setattr("tools.about.is_cloud_based_environment", lambda: False)
+    local_doc = about.about_pb_cli()
+    assert about.about_pb_cli() is local_doc
+    assert "python3 -m venv .venv" in local_doc
+
+    monkeypatch.setattr("tools.about.is_cloud_based_environment", lambda: True)
+    cloud_doc = about.about_pb_cli()
+    assert "No virtual environment setup required" in cloud_doc
+    assert About._render_pb_cli.cache_info().misses == 2
+
+
+def test_about_instances_carry_no_per_instance_dict():
+    assert not hasattr(About(), "__dict__")
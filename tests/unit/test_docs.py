@@ -0,0 +1,29 @@
+from unittest.mock import patch
+
+import pytest
+
+from tools.docs import Docs
+
+
+@patch("tools.docs.RAGSearchAPIClient")
+def test_repeated_query_is_served_from_cache(mock_client_cls):
+    search = mock_client_cls.return_value.search
+    search.return_value = ["doc a", "doc b"]
+    docs = Docs()
+
+    assert docs.query("entity vars") == ["doc a", "doc b"]
+    assert docs.query("entity vars") == ["doc a", "doc b"]
+    docs.query("id stitcher")
+
+    assert search.call_count == 2
+
+
+@patch("tools.docs.RAGSearchAPIClient")
+def test_failed_query_is_not_cached(mock_client_cls):
+    search = mock_client_cls.return_value.search
+    search.side_effect = [RuntimeError("unavailable"), ["doc a"]]
+    docs = Docs()
+
+    with pytest.raises(RuntimeError):
+        docs.query("entity vars")
+    assert docs.query("entity vars") == ["doc a"]
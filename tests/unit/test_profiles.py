@@ -0,0 +1,243 @@
+import codecs
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tools.profiles import (
+    ProfilesTools,
+    _load_yaml,
+    _load_yaml_cached,
+    _walk_yaml_files,
+)
+
+
+def test_yaml_is_parsed_once_until_the_file_changes(tmp_path):
+    _load_yaml_cached.cache_clear()
+    config_path = tmp_path / "siteconfig.yaml"
+    config_path.write_text("connections:\n  dev: {}\n")
+
+    first = _load_yaml(config_path)
+    first["connections"]["mutated"] = {}
+    assert _load_yaml(config_path) == {"connections": {"dev": {}}}
+    assert _load_yaml_cached.cache_info().misses == 1
+
+    config_path.write_text("connections:\n  dev: {}\n  prod: {}\n")
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert list(_load_yaml(config_path)["connections"]) == ["dev", "prod"]
+    assert _load_yaml_cached.cache_info().misses == 2
+
+
+def test_analyze_project_structure_finds_model_yaml_files(tmp_path):
+    (tmp_path / "pb_project.yaml").write_text("model_folders:\n  - models\n")
+    models = tmp_path / "models"
+    (models / "nested").mkdir(parents=True)
+    (models / "inputs.yaml").write_text("inputs: []\n")
+    (models / "nested" / "profiles.yml").write_text("models: []\n")
+    (models / "notes.txt").write_text("not yaml")
+    (models / ".hidden").mkdir()
+    (models / ".hidden" / "skipped.yaml").write_text("x: 1\n")
+
+    analysis = ProfilesTools()._analyze_project_structure(str(tmp_path))
+
+    assert sorted(analysis["yaml_files"]) == [
+        "models/inputs.yaml",
+        os.path.join("models", "nested", "profiles.yml"),
+        "pb_project",
+    ]
+    assert analysis["yaml_files"]["models/inputs.yaml"]["size_bytes"] == 11
+    assert analysis["summary"]["model_folders_scanned"] == 1
+
+
+def test_walk_yaml_files_follows_symlinked_dirs_once(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "x.yaml").write_text("x: 1\n")
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "linked").symlink_to(shared, target_is_directory=True)
+    (shared / "loop").symlink_to(models, target_is_directory=True)
+
+    found = sorted(path for path, _, _ in _walk_yaml_files(str(models)))
+
+    assert found == [os.path.join(str(models), "linked", "x.yaml")]
+
+
+def test_walk_yaml_files_skips_unreadable_dirs(tmp_path):
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "inputs.yaml").write_text("inputs: []\n")
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.path.basename(path) == "locked":
+            raise PermissionError(path)
+        return real_scandir(path)
+
+    with patch("tools.profiles.os.scandir", side_effect=scandir):
+        found = [name for _, name, _ in _walk_yaml_files(str(tmp_path))]
+
+    assert found == ["inputs.yaml"]
+
+
+def test_extract_json_from_output_strips_ansi_codes():
+    output = 'Loading project\n\x1b[32m{"model": {"name": "users"}}\x1b[0m\n'
+
+    assert ProfilesTools().extract_json_from_output(output) == {
+        "model": {"name": "users"}
+    }
+
+
+def test_extract_json_from_output_handles_braces_in_strings_and_trailing_logs():
+    output = 'prefix {"sql": "SELECT \'}\' AS x", "n": 1}\nDone in 2s {elapsed}\n'
+
+    assert ProfilesTools().extract_json_from_output(output) == {
+        "sql": "SELECT '}' AS x",
+        "n": 1,
+    }
+
+
+def test_analyze_project_structure_reports_missing_or_new_projects(tmp_path):
+    tools = ProfilesTools()
+
+    missing = tools._analyze_project_structure(str(tmp_path / "missing"))
+    assert missing["errors"][0].startswith("Project directory does not exist")
+
+    not_a_dir = tmp_path / "file.txt"
+    not_a_dir.write_text("")
+    assert tools._analyze_project_structure(str(not_a_dir))["errors"][0].startswith(
+        "Path is not a directory"
+    )
+
+    greenfield = tools._analyze_project_structure(str(tmp_path))
+    assert not greenfield["pb_project_found"]
+    assert greenfield["warnings"][0].startswith("pb_project.yaml not found")
+
+
+@patch("tools.profiles.shutil.which", return_value="/usr/bin/python3")
+@patch("tools.profiles.subprocess.run")
+def test_setup_rejects_unsupported_python_version(mock_run, mock_which, tmp_path):
+    mock_run.return_value = MagicMock(stdout="[3, 11]\n")
+
+    result = ProfilesTools().setup_new_profiles_project(str(tmp_path))
+
+    assert result["status"] == "failure"
+    assert result["errors"] == [
+        "Python version 3.11 detected. Python 3.10 is required."
+    ]
+
+
+def test_check_package_installed_uses_isolated_find_spec(tmp_path):
+    with patch("tools.profiles.subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=0)
+        assert ProfilesTools()._check_package_installed(
+            str(tmp_path), "profiles_mlcorelib"
+        )
+
+        mock_run.return_value = MagicMock(returncode=1)
+        assert not ProfilesTools()._check_package_installed(
+            str(tmp_path), "missing_pkg"
+        )
+
+    cmd = mock_run.call_args.args[0]
+    assert cmd[1] == "-I" and "find_spec" in cmd[3] and cmd[-1] == "missing_pkg"
+
+
+def test_get_profiles_models_details_groups_models_by_entity(tmp_path):
+    models = {
+        "a": {"model_type": "feature_view", "model_path": "user/all", "material_name": "user_fv"},
+        "b": {"model_type": "id_stitcher", "model_path": "user/default_id", "material_name": "user_default_id_stitcher"},
+        "c": {"model_type": "id_stitcher", "model_path": "user/custom_id", "material_name": "user_id_graph"},
+        "d": {"model_type": "id_stitcher", "model_path": "models/x", "material_name": "ignored"},
+        "e": {"model_type": "sql_template", "model_path": "user/sql", "material_name": "other"},
+    }
+    output_path = tmp_path / "models.txt"
+    tools = ProfilesTools()
+
+    for content in (json.dumps(models), "\x1b[32mLoading\x1b[0m\n" + json.dumps(models)):
+        output_path.write_text(content)
+        with patch.object(tools, "get_profiles_output_schema", return_value="db.out"):
+            details = tools.get_profiles_models_details("pb_project.yaml", str(output_path))
+
+        assert details == {
+            "output_schema": "DB.OUT",
+            "tables_info": {
+                "user": {
+                    "feature_views": ["DB.OUT.USER_FV"],
+                    "id_stitcher": "DB.OUT.USER_ID_GRAPH",
+                }
+            },
+        }
+
+
+@pytest.mark.parametrize(
+    "bom, encoding",
+    [(codecs.BOM_UTF16_LE, "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16-be")],
+)
+def test_analyze_project_structure_reads_utf16_pb_project(tmp_path, bom, encoding):
+    (tmp_path / "pb_project.yaml").write_bytes(
+        bom + "name: café\nmodel_folders:\n  - models\n".encode(encoding)
+    )
+    (tmp_path / "models").mkdir()
+
+    analysis = ProfilesTools()._analyze_project_structure(str(tmp_path))
+
+    assert analysis["errors"] == []
+    assert analysis["pb_project_config"]["name"] == "café"
+    assert analysis["model_folders"] == ["models"]
+
+
+@patch("tools.profiles.is_cloud_based_environment", return_value=False)
+@patch("tools.profiles.shutil.which", return_value="/usr/bin/python3")
+@patch("tools.profiles.subprocess.run")
+def test_setup_installs_profiles_packages_in_one_pip_run(
+    mock_run, mock_which, mock_cloud, tmp_path
+):
+    mock_run.return_value = MagicMock(stdout="[3, 10]\n", stderr="")
+
+    result = ProfilesTools().setup_new_profiles_project(str(tmp_path))
+
+    assert result["status"] == "success"
+    pip_calls = [c.args[0] for c in mock_run.call_args_list if "install" in c.args[0]]
+    assert len(pip_calls) == 1
+    assert pip_calls[0][-2:] == ["profiles-rudderstack", "profiles_mlcorelib"]
+
+
+def test_fake_name_pattern_matches_any_placeholder_substring():
+    assert ProfilesTools._FAKE_NAME_RE.search("prod.my_schema.events")
+    assert ProfilesTools._FAKE_NAME_RE.search("demo_tracks")
+    assert not ProfilesTools._FAKE_NAME_RE.search("analytics.rudder.tracks")
+    assert all(ProfilesTools._FAKE_NAME_RE.search(p) for p in ProfilesTools.FAKE_NAME_PATTERNS)
+
+
+def test_workflow_action_handlers_exist():
+    tools = ProfilesTools()
+
+    for handler_name in ProfilesTools._ACTION_HANDLERS.values():
+        assert callable(getattr(tools, handler_name))
+    guide = tools.workflow_guide("build customer profiles", current_action="start")
+    assert isinstance(guide, dict)
+
+
+def test_analyze_project_structure_relative_paths_for_any_folder_spelling(tmp_path):
+    project = tmp_path / "project"
+    (project / "models").mkdir(parents=True)
+    (project / "models" / "inputs.yaml").write_text("inputs: []\n")
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "macros.yaml").write_text("macros: []\n")
+    (project / "pb_project.yaml").write_text(
+        "model_folders:\n  - ./models/\n  - ../shared\n"
+    )
+
+    analysis = ProfilesTools()._analyze_project_structure(str(project))
+
+    assert sorted(analysis["yaml_files"]) == [
+        os.path.join("..", "shared", "macros.yaml"),
+        os.path.join("models", "inputs.yaml"),
+        "pb_project",
+    ]
+    inputs = analysis["yaml_files"][os.path.join("models", "inputs.yaml")]
+    assert inputs["filename"] == "inputs.yaml"
+    assert inputs["path"] == str(project / "models" / "inputs.yaml")
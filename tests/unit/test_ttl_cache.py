@@ -0,0 +1,43 @@
+from utils.ttl_cache import TTLCache
+
+
+def test_get_or_load_caches_until_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("utils.ttl_cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl_seconds=10)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("k", loader) == 1
+    assert cache.get_or_load("k", loader) == 1
+
+    now[0] += 10
+    assert cache.get_or_load("k", loader) == 2
+    assert len(calls) == 2
+
+
+def test_oldest_entry_is_evicted_at_maxsize():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_invalidate_and_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert len(cache) == 0
@@ -70,6 +70,7 @@ def test_validate_identifier_invalid():
         "invalid/name",
         "invalid'name",  # single quote
         'invalid"name',  # double quote
+        "invalid\n",  # trailing newline
         "",  # empty
         None,
     ]
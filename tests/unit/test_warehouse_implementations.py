@@ -1,5 +1,11 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 from unittest.mock import MagicMock, patch
+from databricks.sql.exc import DatabaseError, Error, RequestError
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud.bigquery import SchemaField
+from google.cloud.bigquery.table import Row
 from tools.snowflake import Snowflake
 from tools.bigquery import BigQuery
 from tools.databricks import Databricks
@@ -38,14 +44,14 @@ def test_bigquery_init_adc(mock_default, mock_client_cls, mock_bigquery_details)
 
 
 @patch("tools.bigquery.bigquery.Client")
-@patch("tools.bigquery.service_account.Credentials")
+@patch("tools.bigquery.service_account")
 def test_bigquery_init_service_account(
     mock_creds_cls, mock_client_cls, mock_bigquery_details
 ):
     wh = BigQuery()
     wh.initialize_connection(mock_bigquery_details)
 
-    mock_creds_cls.from_service_account_info.assert_called_once()
+    mock_creds_cls.Credentials.from_service_account_info.assert_called_once()
     mock_client_cls.assert_called_once()
 
 
@@ -62,13 +68,30 @@ def test_databricks_init_pat(mock_connect):
     wh = Databricks()
     wh.initialize_connection(details)
 
+    # The connection is opened on first use, not during initialization
+    mock_connect.assert_not_called()
+    wh.ensure_valid_session()
+    wh.ensure_valid_session()
+
     mock_connect.assert_called_once()
+    # No liveness probe; dropped connections are handled by raw_query
+    mock_connect.return_value.cursor.assert_not_called()
     _, kwargs = mock_connect.call_args
     assert kwargs["server_hostname"] == "test-host"
     assert kwargs["http_path"] == "test-path"
     assert kwargs["access_token"] == "test-token"
 
 
+def test_databricks_init_rejects_missing_credentials_without_connecting():
+    with patch("tools.databricks.sql.connect") as mock_connect:
+        with pytest.raises(Exception, match="No valid authentication method"):
+            Databricks().initialize_connection(
+                {"type": "databricks", "host": "h", "http_endpoint": "p"}
+            )
+
+    mock_connect.assert_not_called()
+
+
 # --- Redshift Tests ---
 @patch("tools.redshift.redshift_connector.connect")
 def test_redshift_init_password(mock_connect):
@@ -88,3 +111,490 @@ def test_redshift_init_password(mock_connect):
     _, kwargs = mock_connect.call_args
     assert kwargs["host"] == "test-host"
     assert kwargs["user"] == "test-user"
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_describe_table_reuses_cached_metadata(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    field = MagicMock(field_type="STRING", mode="NULLABLE")
+    field.name = "user_id"
+    client = mock_client_cls.return_value
+    client.get_table.return_value = MagicMock(schema=[field])
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+
+    first = wh.describe_table("proj", "ds", "tracks")
+    second = wh.describe_table("proj", "ds", "tracks")
+
+    assert first == second == ["user_id: STRING (nullable)"]
+    client.get_table.assert_called_once_with("proj.ds.tracks")
+
+
+@pytest.mark.parametrize(
+    "details, pool_connections, pool_maxsize",
+    [({}, 20, 50), ({"pool_connections": "4", "pool_maxsize": 64}, 4, 64)],
+)
+def test_bigquery_http_pool_is_sized_from_connection_details(
+    details, pool_connections, pool_maxsize
+):
+    session = BigQuery._authorized_session(MagicMock(), details)
+
+    adapter = session.get_adapter("https://bigquery.googleapis.com")
+    assert adapter._pool_connections == pool_connections
+    assert adapter._pool_maxsize == pool_maxsize
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_client_uses_the_pooled_session(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    wh = BigQuery()
+    wh.initialize_connection({**mock_bigquery_details, "pool_maxsize": 8})
+
+    http = mock_client_cls.call_args.kwargs["_http"]
+    assert isinstance(http, AuthorizedSession)
+    assert http.get_adapter("https://bigquery.googleapis.com")._pool_maxsize == 8
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_input_table_suggestions_across_datasets(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    def table(table_id):
+        item = MagicMock()
+        item.table_id = table_id
+        return item
+
+    listings = {
+        "proj.ds1": [table("tracks"), table("identifies"), table("order_completed")],
+        "proj.ds2": [table("pages"), table("unrelated")],
+    }
+    client = mock_client_cls.return_value
+    client.list_tables.side_effect = lambda ref: listings[ref]
+    client.query.return_value.result.return_value = [
+        {"event": "Order_Completed", "count": 3}
+    ]
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    suggestions = wh.input_table_suggestions("proj", "ds1, ds2")
+
+    assert sorted(suggestions) == [
+        "proj.ds1.identifies",
+        "proj.ds1.order_completed",
+        "proj.ds1.tracks",
+        "proj.ds2.pages",
+    ]
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_session_probe_is_skipped_within_ttl(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    client = mock_client_cls.return_value
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+
+    wh.ensure_valid_session()
+    wh.ensure_valid_session()
+
+    client.query.assert_called_once_with("SELECT 1 as test_column")
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_raw_query_pandas_fills_only_object_nulls(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    df = pd.DataFrame({"name": ["a", None], "score": [1.0, None]})
+    mock_client_cls.return_value.query.return_value.to_dataframe.return_value = df
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    result = wh.raw_query("SELECT name, score FROM t", response_type="pandas")
+
+    assert result["name"].tolist() == ["a", "Null"]
+    assert pd.isna(result["score"].iloc[1])
+
+
+@patch("tools.bigquery.bigquery_storage")
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_storage_client_is_created_lazily_and_closed_on_rebuild(
+    mock_creds_cls, mock_client_cls, mock_storage, mock_bigquery_details
+):
+    first_reader, second_reader = MagicMock(), MagicMock()
+    mock_storage.BigQueryReadClient.side_effect = [first_reader, second_reader]
+    query_job = mock_client_cls.return_value.query.return_value
+    query_job.to_dataframe.return_value = pd.DataFrame({"n": [1]})
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    mock_storage.BigQueryReadClient.assert_not_called()
+
+    wh.raw_query("SELECT 1 AS n", response_type="pandas")
+    wh.raw_query("SELECT 1 AS n", response_type="pandas")
+    mock_storage.BigQueryReadClient.assert_called_once()
+    assert query_job.to_dataframe.call_args.kwargs["bqstorage_client"] is first_reader
+
+    wh.create_session()
+    first_reader.transport.close.assert_called_once()
+    wh.raw_query("SELECT 1 AS n", response_type="pandas")
+    assert query_job.to_dataframe.call_args.kwargs["bqstorage_client"] is second_reader
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_table_listing_is_cached_per_dataset(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    client = mock_client_cls.return_value
+    client.list_tables.return_value = []
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    wh.input_table_suggestions("proj", "ds1")
+    wh.input_table_suggestions("proj", "ds1")
+
+    client.list_tables.assert_called_once_with("proj.ds1")
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_raw_query_list_returns_row_dicts(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    field_to_index = {"event": 0, "count": 1}
+    rows = MagicMock()
+    rows.schema = [SchemaField("event", "STRING"), SchemaField("count", "INTEGER")]
+    rows.__iter__.return_value = iter(
+        [Row(("signup", 3), field_to_index), Row(("login", 2), field_to_index)]
+    )
+    mock_client_cls.return_value.query.return_value.result.return_value = rows
+
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    result = wh.raw_query("SELECT event, count FROM t")
+
+    assert result == [{"event": "signup", "count": 3}, {"event": "login", "count": 2}]
+
+
+@patch("tools.bigquery.bigquery.Client")
+@patch("tools.bigquery.service_account")
+def test_bigquery_concurrent_validation_rebuilds_client_once(
+    mock_creds_cls, mock_client_cls, mock_bigquery_details
+):
+    wh = BigQuery()
+    wh.initialize_connection(mock_bigquery_details)
+    mock_client_cls.return_value.query.side_effect = Exception("expired")
+    mock_client_cls.reset_mock()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: wh.ensure_valid_session(), range(8)))
+
+    mock_client_cls.assert_called_once()
+
+
+@patch("tools.databricks.sql.connect")
+def test_databricks_qualify_uses_catalog_or_legacy_names(mock_connect):
+    details = {
+        "type": "databricks",
+        "host": "test-host",
+        "http_endpoint": "test-path",
+        "access_token": "test-token",
+    }
+
+    legacy = Databricks()
+    legacy.initialize_connection(details)
+    assert legacy._qualify("sch", "tbl") == "sch.tbl"
+    assert legacy._qualify("sch", "tbl", "db") == "db.sch.tbl"
+    assert legacy._qualify("sch", "tbl", "sch") == "sch.tbl"
+
+    unity = Databricks()
+    unity.initialize_connection({**details, "catalog": " main "})
+    assert unity._qualify("sch", "tbl", "db") == "main.sch.tbl"
+    assert unity._qualify("sch") == "main.sch"
+
+
+@pytest.mark.parametrize(
+    "failing_call, error",
+    [
+        ("execute", RequestError("closed")),
+        # Expired server session (INVALID_HANDLE_STATUS)
+        ("execute", DatabaseError("Invalid SessionHandle: 01ef-abcd")),
+        # cursor() on a closed connection in connector 2.x
+        ("cursor", Error("Attempting operation on closed connection")),
+    ],
+)
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_reconnects_once_when_query_hits_closed_connection(
+    mock_connect, failing_call, error
+):
+    stale, fresh = MagicMock(), MagicMock()
+    mock_connect.side_effect = [stale, fresh]
+    if failing_call == "cursor":
+        stale.cursor.side_effect = error
+    else:
+        stale.cursor.return_value.execute.side_effect = error
+    fresh.cursor.return_value.fetchall.return_value = [(1,)]
+    fresh.cursor.return_value.description = [("value",)]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+    wh.ensure_valid_session()  # opens the first connection
+
+    assert wh.raw_query("SELECT 1 AS value") == [{"value": 1}]
+    assert wh.session is fresh
+    assert mock_connect.call_count == 2
+
+
+@patch("tools.databricks.sql.connect")
+def test_databricks_does_not_reconnect_on_query_errors(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.execute.side_effect = DatabaseError("[TABLE_OR_VIEW_NOT_FOUND] t")
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    with pytest.raises(Exception, match="TABLE_OR_VIEW_NOT_FOUND"):
+        wh.raw_query("SELECT * FROM t")
+    mock_connect.assert_called_once()
+
+
+@patch("tools.databricks.sql.connect")
+def test_databricks_reopens_a_closed_connection(mock_connect):
+    closed, fresh = MagicMock(open=False), MagicMock(open=True)
+    mock_connect.side_effect = [closed, fresh]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+    wh.ensure_valid_session()  # opens a connection that is then closed, e.g. by cleanup()
+    wh.ensure_valid_session()
+
+    assert wh.session is fresh
+    assert mock_connect.call_count == 2
+
+
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_fetch_errors_do_not_rerun_the_statement(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchall.side_effect = RequestError("connection reset while fetching")
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    with pytest.raises(Exception, match="connection reset while fetching"):
+        wh.raw_query("INSERT INTO t VALUES (1)")
+    cursor.execute.assert_called_once()
+    mock_connect.assert_called_once()
+
+
+def _databricks_suggestions(fail_union: bool):
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+    event_queries = []
+
+    def fake_raw_query(query, response_type="list", max_rows=None):
+        if query == "SHOW TABLES IN missing":
+            raise Exception("SCHEMA_NOT_FOUND")
+        if query.startswith("SHOW TABLES"):
+            assert response_type == "columns"
+            return {
+                "database": ["sch"] * 4,
+                "tableName": ["Tracks", "web_tracks", "order_completed", "users"],
+            }
+        event_queries.append(query)
+        if "UNION ALL" in query and fail_union:
+            raise Exception("UNRESOLVED_COLUMN: event")
+        if "web_tracks" in query and fail_union:
+            raise Exception("UNRESOLVED_COLUMN: event")
+        return {"event": ["Order_Completed", None], "count": [3, 1]}
+
+    with patch.object(wh, "ensure_valid_session"), patch.object(
+        wh, "raw_query", side_effect=fake_raw_query
+    ):
+        suggestions = wh.input_table_suggestions("", "sch, missing")
+    return sorted(suggestions), event_queries
+
+
+def test_databricks_input_table_suggestions_fuses_event_queries():
+    suggestions, event_queries = _databricks_suggestions(fail_union=False)
+
+    assert suggestions == ["sch.Tracks", "sch.order_completed", "sch.web_tracks"]
+    assert len(event_queries) == 1
+    assert event_queries[0].count("UNION ALL") == 1
+
+
+def test_databricks_input_table_suggestions_falls_back_per_table():
+    suggestions, event_queries = _databricks_suggestions(fail_union=True)
+
+    assert suggestions == ["sch.Tracks", "sch.order_completed", "sch.web_tracks"]
+    assert len(event_queries) == 3
+
+
+@patch("tools.databricks.pa", MagicMock())
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_pandas_fills_only_object_nulls(mock_connect):
+    df = pd.DataFrame({"name": ["a", None], "score": [1.0, None]})
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchall_arrow.return_value.to_pandas.return_value = df
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+    result = wh.raw_query("SELECT name, score FROM t", response_type="pandas")
+
+    assert result["name"].tolist() == ["a", "Null"]
+    assert pd.isna(result["score"].iloc[1])
+
+
+@patch("tools.databricks.pa", MagicMock())
+@patch("tools.databricks.sql.connect")
+def test_databricks_describe_table_reads_arrow_columns(mock_connect):
+    columns = {
+        "col_name": ["id", "name", "", "# Partition Information"],
+        "data_type": ["bigint", "string", "", None],
+        "comment": [None, None, None, None],
+    }
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchmany_arrow.return_value.to_pydict.return_value = columns
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    assert wh.describe_table("", "sch", "tbl") == [
+        "id: bigint",
+        "name: string",
+        "# Partition Information: None",
+    ]
+    cursor.execute.assert_called_with("DESCRIBE TABLE sch.tbl")
+    cursor.fetchmany_arrow.assert_called_once_with(2000)
+
+    # A repeat describe is served from the cache until the connection is rebuilt
+    assert wh.describe_table("", "sch", "tbl")[0] == "id: bigint"
+    cursor.fetchmany_arrow.assert_called_once()
+    wh.create_session()
+    wh.describe_table("", "sch", "tbl")
+    assert cursor.fetchmany_arrow.call_count == 2
+
+
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_describe_table_reads_rows_without_pyarrow(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchmany.return_value = [("id", "bigint", None), ("", "", None)]
+    cursor.description = [("col_name",), ("data_type",), ("comment",)]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    assert wh.describe_table("", "sch", "tbl") == ["id: bigint"]
+    cursor.fetchmany.assert_called_once_with(2000)
+    cursor.fetchmany_arrow.assert_not_called()
+
+
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_arrow_requires_pyarrow(mock_connect):
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    with pytest.raises(Exception, match="requires pyarrow"):
+        wh.raw_query("SELECT 1", response_type="arrow")
+    mock_connect.return_value.cursor.return_value.execute.assert_not_called()
+
+
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_columns_response(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchall.return_value = [("sch", "a"), ("sch", "b")]
+    cursor.description = [("database",), ("tableName",)]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    assert wh.raw_query("SHOW TABLES IN sch", response_type="columns") == {
+        "database": ["sch", "sch"],
+        "tableName": ["a", "b"],
+    }
+
+
+@patch("tools.databricks.pa", MagicMock())
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_pandas_falls_back_without_requery(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    arrow_table = cursor.fetchall_arrow.return_value
+    arrow_table.to_pandas.side_effect = TypeError("unsupported type")
+    arrow_table.to_pylist.return_value = [{"name": "a"}]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    assert wh.raw_query("SELECT name FROM t", response_type="pandas") == [{"name": "a"}]
+    cursor.execute.assert_called_once()
+
+
+@patch("tools.databricks.pa", None)
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_pandas_reads_rows_without_pyarrow(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchall.return_value = [("a", 1.0), (None, None)]
+    cursor.description = [("name",), ("score",)]
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+    result = wh.raw_query("SELECT name, score FROM t", response_type="pandas")
+
+    assert isinstance(result, pd.DataFrame)
+    assert result["name"].tolist() == ["a", "Null"]
+    assert pd.isna(result["score"].iloc[1])
+    cursor.fetchall_arrow.assert_not_called()
+
+
+@patch("tools.databricks.pa", MagicMock())
+@patch("tools.databricks.sql.connect")
+def test_databricks_raw_query_list_reads_arrow_when_available(mock_connect):
+    cursor = mock_connect.return_value.cursor.return_value
+    cursor.fetchall_arrow.return_value.to_pylist.return_value = [{"value": 1}]
+    cursor.fetchall_arrow.return_value.to_pydict.return_value = {"value": [1]}
+
+    wh = Databricks()
+    wh.initialize_connection(
+        {"type": "databricks", "host": "h", "http_endpoint": "p", "access_token": "t"}
+    )
+
+    assert wh.raw_query("SELECT 1 AS value") == [{"value": 1}]
+    assert wh.raw_query("SELECT 1 AS value", response_type="columns") == {"value": [1]}
+    cursor.fetchall.assert_not_called()